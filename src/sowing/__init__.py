@@ -3,3 +3,5 @@ from .zipper import Zipper
 from .hedge import Hedge
 from . import traversal as traversal
 from . import indexed as indexed
+from . import intern as intern
+from . import frozen as frozen
@@ -6,7 +6,7 @@ from typing import Iterable
 
 
 def is_binary(root: Node) -> bool:
-    return all(len(cursor.node.edges) in (0, 2) for cursor in traversal.depth(root))
+    return all(len(node.edges) in (0, 2) for node in traversal.nodes(root))
 
 
 def binarize_at(root: Node, default: Node = Node()) -> Iterable[Node]:
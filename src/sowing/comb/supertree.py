@@ -65,12 +65,16 @@ def breakup(root: Node) -> tuple[list[Node], list[Triple], list[Fan]]:
         if base.is_root():
             return cursor
 
-        outgroup = next(traversal.leaves(base.sibling().node)).node
+        outgroup = next(
+            node
+            for node in traversal.nodes(base.sibling().node, preorder=True)
+            if not node.edges
+        )
         triples.append(Triple(children, outgroup))
         return base.replace(node=children[0])
 
     traversal.fold(extract_parts, traversal.depth(root))
-    leaves = [cursor.node for cursor in traversal.leaves(root)]
+    leaves = [node for node in traversal.nodes(root) if not node.edges]
     return leaves, triples, fans
 
 
@@ -0,0 +1,299 @@
+from array import array
+from collections.abc import Hashable, Iterator
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from .node import Node, Edge
+from .util.keys import exact_key
+
+NodeData = TypeVar("NodeData", bound=Hashable)
+EdgeData = TypeVar("EdgeData", bound=Hashable)
+
+# Marker for missing links in the topology arrays
+NONE = -1
+
+
+class FrozenTree(Generic[NodeData, EdgeData]):
+    """
+    Compact immutable tree stored as a set of integer arrays.
+
+    Nodes are numbered in preorder, starting from 0 for the root, so that
+    the nodes of each subtree are numbered consecutively. The tree topology
+    is described by the parent, first child and next sibling of each node,
+    with :data:`NONE` standing for missing links. Data attached to nodes and
+    to the edges leading to them is stored once per distinct value in a
+    shared table, and referred to by its position in that table.
+
+    This uses much less memory than the equivalent :class:`Node` objects, at
+    the expense of not supporting edits. Positions can be accessed through
+    lightweight views, which are created on demand.
+    """
+
+    __slots__ = [
+        "parent",
+        "first_child",
+        "next_sibling",
+        "_node_data",
+        "_edge_data",
+        "_values",
+    ]
+
+    def __init__(
+        self,
+        parent: array,
+        first_child: array,
+        next_sibling: array,
+        node_data: array,
+        edge_data: array,
+        values: list,
+    ):
+        """
+        Create a tree from its arrays.
+
+        :param parent: parent of each node
+        :param first_child: first child of each node
+        :param next_sibling: next sibling of each node
+        :param node_data: position in the table of the data of each node
+        :param edge_data: position in the table of the data of the edge
+            leading to each node
+        :param values: table of distinct data values
+        """
+        self.parent = parent
+        self.first_child = first_child
+        self.next_sibling = next_sibling
+        self._node_data = node_data
+        self._edge_data = edge_data
+        self._values = values
+
+    @classmethod
+    def from_node(
+        cls,
+        root: Node[NodeData, EdgeData],
+    ) -> "FrozenTree[NodeData, EdgeData]":
+        """
+        Convert a tree made of nodes.
+
+        Complexity: O(n), with n the number of nodes below :param:`root`.
+        Subtrees repeated in several places are stored each time they appear.
+
+        :param root: root of the tree to convert
+        :returns: converted tree
+        """
+        parent = array("i")
+        first_child = array("i")
+        next_sibling = array("i")
+        node_data = array("I")
+        edge_data = array("I")
+
+        # Distinct data values, and index of each one in that list by a key
+        # telling apart equal values of different types
+        distinct: list[Hashable] = []
+        values: dict[Hashable, int] = {}
+
+        def index(value: Hashable) -> int:
+            key = exact_key(value)
+
+            if (position := values.get(key)) is None:
+                position = values[key] = len(distinct)
+                distinct.append(value)
+
+            return position
+
+        # Last child added to each node so far
+        last_child = array("i")
+        stack = [(root, None, NONE)]
+
+        while stack:
+            node, branch, up = stack.pop()
+            current = len(parent)
+            parent.append(up)
+            first_child.append(NONE)
+            next_sibling.append(NONE)
+            last_child.append(NONE)
+            node_data.append(index(node.data))
+            edge_data.append(index(branch))
+
+            if up != NONE:
+                if last_child[up] == NONE:
+                    first_child[up] = current
+                else:
+                    next_sibling[last_child[up]] = current
+
+                last_child[up] = current
+
+            stack.extend(
+                (edge.node, edge.data, current) for edge in reversed(node.edges)
+            )
+
+        return cls(
+            parent,
+            first_child,
+            next_sibling,
+            node_data,
+            edge_data,
+            distinct,
+        )
+
+    def to_node(self, index: int = 0) -> Node[NodeData, EdgeData]:
+        """
+        Convert a subtree back into nodes.
+
+        Complexity: O(n), with n the number of nodes in the subtree.
+
+        :param index: root of the subtree to convert (default: whole tree)
+        :returns: converted subtree
+        """
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        node_data = self._node_data
+        edge_data = self._edge_data
+        values = self._values
+
+        # Edges leading to converted subtrees, the ones on top being the
+        # first children of the next node to convert
+        stack = []
+
+        for current in reversed(range(index, self._end(index))):
+            arity = 0
+            child = first_child[current]
+
+            while child != NONE:
+                arity += 1
+                child = next_sibling[child]
+
+            if arity:
+                edges = tuple(stack[: -arity - 1 : -1])
+                del stack[-arity:]
+            else:
+                edges = ()
+
+            node = Node(values[node_data[current]], edges)
+            stack.append(Edge(node, values[edge_data[current]]))
+
+        return stack[0].node
+
+    def __len__(self) -> int:
+        """Get the number of nodes in the tree."""
+        return len(self.parent)
+
+    def __getitem__(self, index: int) -> "FrozenNode[NodeData, EdgeData]":
+        """
+        Get a view on a node of the tree.
+
+        :param index: index of the node
+        :returns: view on the node
+        """
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("node index out of range")
+
+        return FrozenNode(self, index)
+
+    def data(self, index: int) -> NodeData:
+        """Get the data attached to a node."""
+        return self._values[self._node_data[index]]
+
+    def branch(self, index: int) -> EdgeData:
+        """Get the data attached to the edge leading to a node."""
+        return self._values[self._edge_data[index]]
+
+    def _end(self, index: int) -> int:
+        """Find the index following the last node of a subtree."""
+        while index != NONE:
+            if (sibling := self.next_sibling[index]) != NONE:
+                return sibling
+
+            index = self.parent[index]
+
+        return len(self)
+
+    def size(self, index: int = 0) -> int:
+        """Get the number of nodes in a subtree."""
+        return self._end(index) - index
+
+    def children(self, index: int = 0) -> Iterator[int]:
+        """Iterate through the children of a node."""
+        child = self.first_child[index]
+
+        while child != NONE:
+            yield child
+            child = self.next_sibling[child]
+
+    def preorder(self, index: int = 0) -> Iterator[int]:
+        """Iterate through the nodes of a subtree, parents first."""
+        return iter(range(index, self._end(index)))
+
+    def postorder(self, index: int = 0) -> Iterator[int]:
+        """Iterate through the nodes of a subtree, children first."""
+        first_child = self.first_child
+        next_sibling = self.next_sibling
+        parent = self.parent
+        current = index
+
+        while True:
+            while (child := first_child[current]) != NONE:
+                current = child
+
+            yield current
+
+            while current != index and (sibling := next_sibling[current]) == NONE:
+                current = parent[current]
+                yield current
+
+            if current == index:
+                return
+
+            current = sibling
+
+    def leaves(self, index: int = 0) -> Iterator[int]:
+        """Iterate through the leaves of a subtree, from left to right."""
+        first_child = self.first_child
+
+        for current in range(index, self._end(index)):
+            if first_child[current] == NONE:
+                yield current
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenNode(Generic[NodeData, EdgeData]):
+    """View on a node of a :class:`FrozenTree`, mimicking :class:`Node`."""
+
+    # Tree containing the node
+    tree: FrozenTree[NodeData, EdgeData]
+
+    # Index of the node in the tree
+    index: int
+
+    @property
+    def data(self) -> NodeData:
+        """Data attached to this node."""
+        return self.tree.data(self.index)
+
+    @property
+    def edges(self) -> tuple[Edge[NodeData, EdgeData], ...]:
+        """Outgoing edges towards views on the child nodes."""
+        tree = self.tree
+        return tuple(
+            Edge(FrozenNode(tree, child), tree.branch(child))
+            for child in tree.children(self.index)
+        )
+
+    @property
+    def parent(self) -> "FrozenNode[NodeData, EdgeData] | None":
+        """View on the parent of this node, or None for the root."""
+        parent = self.tree.parent[self.index]
+        return FrozenNode(self.tree, parent) if parent != NONE else None
+
+    def children(self) -> Iterator["FrozenNode[NodeData, EdgeData]"]:
+        """Iterate through views on the children of this node."""
+        for child in self.tree.children(self.index):
+            yield FrozenNode(self.tree, child)
+
+    def is_leaf(self) -> bool:
+        """Test whether this node has no children."""
+        return self.tree.first_child[self.index] == NONE
+
+    def to_node(self) -> Node[NodeData, EdgeData]:
+        """Convert the subtree rooted at this node into nodes."""
+        return self.tree.to_node(self.index)
@@ -0,0 +1,128 @@
+from typing import Hashable, TypeVar
+from weakref import WeakValueDictionary
+from .node import Node, Edge
+from .util.keys import exact_key
+
+NodeData = TypeVar("NodeData", bound=Hashable)
+EdgeData = TypeVar("EdgeData", bound=Hashable)
+
+
+class InternTable:
+    """
+    Table of unique nodes, used to share structurally equal subtrees.
+
+    Interning a tree replaces each of its subtrees with the first equal
+    subtree interned in the same table, so that equal subtrees become the
+    same object. Comparing two trees interned in the same table is then
+    immediate, since equal trees are identical, and a collection of trees
+    with many repeated parts only uses as much memory as its distinct
+    subtrees.
+
+    Nodes are only weakly referenced by the table, so that they are
+    dropped from it as soon as they are no longer used elsewhere.
+    Data attached to nodes and edges is compared by type and by value,
+    including the items of maps, tuples and frozen sets, so that, for
+    example, nodes labeled with 1 and 1.0, or with (1,) and (True,), are
+    kept apart.
+    """
+
+    __slots__ = ["_nodes"]
+
+    def __init__(self):
+        self._nodes: WeakValueDictionary[tuple, Node] = WeakValueDictionary()
+
+    def __len__(self) -> int:
+        """Get the number of distinct nodes in the table."""
+        return len(self._nodes)
+
+    def intern(self, root: Node[NodeData, EdgeData]) -> Node[NodeData, EdgeData]:
+        """
+        Share the subtrees of a tree with equal subtrees in the table.
+
+        :param root: tree to intern
+        :returns: equal tree, made of interned nodes
+        """
+        nodes = self._nodes
+
+        # Interned counterpart of each visited node, keeping visited nodes
+        # alive so that their identifiers are not reused
+        interned: dict[int, tuple[Node, Node]] = {}
+        stack = [(root, False)]
+
+        while stack:
+            node, expanded = stack.pop()
+
+            if id(node) in interned:
+                continue
+
+            if not expanded:
+                stack.append((node, True))
+                stack.extend(
+                    (edge.node, False)
+                    for edge in reversed(node.edges)
+                    if id(edge.node) not in interned
+                )
+                continue
+
+            children = [interned[id(edge.node)][1] for edge in node.edges]
+            key = (
+                type(node),
+                exact_key(node.data),
+                tuple(
+                    (id(child), exact_key(edge.data))
+                    for child, edge in zip(children, node.edges)
+                ),
+            )
+            result = nodes.get(key)
+
+            if result is None:
+                result = node
+
+                if any(
+                    child is not edge.node for child, edge in zip(children, node.edges)
+                ):
+                    result = node.replace(
+                        edges=tuple(
+                            Edge(child, edge.data)
+                            for child, edge in zip(children, node.edges)
+                        )
+                    )
+
+                nodes[key] = result
+
+            interned[id(node)] = (node, result)
+
+        return interned[id(root)][1]
+
+
+# Table used by default to intern trees
+_table = InternTable()
+
+
+def intern(
+    root: Node[NodeData, EdgeData],
+    table: InternTable | None = None,
+) -> Node[NodeData, EdgeData]:
+    """
+    Share the subtrees of a tree with all equal subtrees interned so far.
+
+    :param root: tree to intern
+    :param table: table to intern the tree in (default: global table)
+    :returns: equal tree, made of interned nodes
+    """
+    if table is None:
+        table = _table
+
+    return table.intern(root)
+
+
+def compress(root: Node[NodeData, EdgeData]) -> Node[NodeData, EdgeData]:
+    """
+    Share the equal subtrees of a tree with each other.
+
+    Unlike :func:`intern`, this does not keep the tree in any table.
+
+    :param root: tree to compress
+    :returns: equal tree, in which each distinct subtree is stored once
+    """
+    return InternTable().intern(root)
@@ -1,6 +1,18 @@
-from typing import Any, Generic, Hashable, Iterable, Self, TypeVar, overload
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    Self,
+    TextIO,
+    TypeVar,
+    overload,
+)
+from itertools import islice
 from dataclasses import dataclass, replace, field
-from collections.abc import Set, Mapping
+from collections.abc import Mapping
 from .util.dataclasses import repr_default
 from .zipper import Zipper
 
@@ -31,9 +43,12 @@ class Edge(Generic[NodeData, EdgeData]):
 
         return replace(self, **kwargs)
 
+    def __reduce__(self) -> tuple:
+        return (self.__class__, (self.node, self.data))
+
 
 @repr_default
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Node(Generic[NodeData, EdgeData]):
     # Arbitrary data attached to this node
     data: NodeData = None
@@ -41,13 +56,28 @@ class Node(Generic[NodeData, EdgeData]):
     # Outgoing edges towards child nodes
     edges: tuple[Edge[NodeData, EdgeData], ...] = ()
 
-    # Cached hash value (to avoid needlessly traversing the whole tree)
-    _hash: int = field(init=False, repr=False, compare=False, default=0)
+    # Cached hash value (to avoid needlessly traversing the whole tree),
+    # only computed when first needed
+    _hash: int | None = field(init=False, repr=False, compare=False, default=None)
 
-    def __post_init__(self) -> None:
-        object.__setattr__(self, "_hash", hash((self.data, self.edges)))
+    # Cached size, height and number of leaves of the subtree,
+    # only computed when first needed
+    _stats: tuple[int, int, int] | None = field(
+        init=False, repr=False, compare=False, default=None
+    )
 
     def __hash__(self) -> int:
+        """
+        Get the hash of the tree, computing it when first needed.
+
+        Data attached to nodes and edges is not hashed on construction, so
+        unhashable data is only reported by this method.
+
+        :raises TypeError: if the tree contains unhashable data
+        """
+        if self._hash is None:
+            _compute_hashes(self)
+
         return self._hash
 
     def __eq__(self, rhs: Any) -> bool:
@@ -57,61 +87,88 @@ class Node(Generic[NodeData, EdgeData]):
         if not isinstance(rhs, self.__class__):
             return NotImplemented
 
-        if self._hash != rhs._hash:
+        if hash(self) != hash(rhs):
             return False
 
-        seen_lhs = {}
-        seen_rhs = {}
+        # Subtree of the right-hand tree last paired with each subtree of the
+        # left-hand tree. Optimization which avoids exponential time
+        # comparisons for trees containing a lot of repeated subtrees:
+        # subtrees that are repeated in both trees are only compared once
+        seen = {}
+        stack = [(self, rhs)]
 
-        cursor_lhs = self.unzip()
-        cursor_rhs = rhs.unzip()
+        while stack:
+            node_lhs, node_rhs = stack.pop()
 
-        while True:
-            node_lhs = cursor_lhs.node
-            id_lhs = id(node_lhs)
-            node_rhs = cursor_rhs.node
-            id_rhs = id(node_rhs)
-            visited = id_lhs in seen_lhs and id_rhs in seen_rhs
+            # Compare node data and outgoing edge data, then schedule
+            # comparing children that are not trivially equal
+            if node_lhs.data != node_rhs.data:
+                return False
 
-            if visited and seen_lhs[id_lhs] == seen_rhs[id_rhs]:
-                # Optimization which avoids exponential time comparisons
-                # for trees containing a lot of repeated subtrees: skip
-                # visiting subtrees that are repeated in both trees,
-                # simply make sure they refer to the same subtree
-                cursor_lhs = cursor_lhs.next(preorder=True, skip_ids=(id_lhs,))
-                cursor_rhs = cursor_rhs.next(preorder=True, skip_ids=(id_rhs,))
+            edges_lhs = node_lhs.edges
+            edges_rhs = node_rhs.edges
 
-            else:
-                # Trees with no repeated parts are compared normally:
-                # same node data and outgoing edge data
-                if node_lhs.data != node_rhs.data:
-                    return False
+            if len(edges_lhs) != len(edges_rhs):
+                return False
 
-                if len(node_lhs.edges) != len(node_rhs.edges):
+            for edge_lhs, edge_rhs in zip(edges_lhs, edges_rhs):
+                if edge_lhs.data != edge_rhs.data:
                     return False
 
-                if any(
-                    edge_lhs.data != edge_rhs.data
-                    for edge_lhs, edge_rhs in zip(node_lhs.edges, node_rhs.edges)
-                ):
-                    return False
+                child_lhs = edge_lhs.node
+                child_rhs = edge_rhs.node
 
-                if visited:
-                    seen_lhs[id_lhs] = seen_rhs[id_rhs]
-                else:
-                    seen_lhs[id_lhs] = len(seen_lhs)
-                    seen_rhs[id_rhs] = len(seen_rhs)
+                if child_lhs is child_rhs:
+                    continue
 
-                cursor_lhs = cursor_lhs.next(preorder=True)
-                cursor_rhs = cursor_rhs.next(preorder=True)
+                # Hashes of all descendants were computed along with
+                # the hashes of the roots
+                if child_lhs._hash != child_rhs._hash:
+                    return False
 
-            # Trees should have the same size, i.e., the root should be
-            # reached again at the same iteration
-            if cursor_lhs.is_root() and cursor_rhs.is_root():
-                return True
+                id_lhs = id(child_lhs)
+                id_rhs = id(child_rhs)
+
+                if seen.get(id_lhs) != id_rhs:
+                    seen[id_lhs] = id_rhs
+                    stack.append((child_lhs, child_rhs))
+
+        return True
+
+    def __reduce__(self) -> tuple:
+        # Pickle nodes level by level, so that nodes reachable from several
+        # pickled objects are stored once. To bound the recursion depth,
+        # nodes at regular heights first pickle the levels below them
+        # bottom-up, so that their children are already pickled when reached
+        height = self.height
+        level = _band_level(height)
+
+        if level:
+            floor = height - _BAND**level
+        elif any(
+            _BAND <= (child := edge.node.height) < height - height % _BAND
+            and not _band_level(child)
+            for edge in self.edges
+        ):
+            # Children skipping to a lower band are handled in the same way,
+            # so that recursion never crosses a band without going through
+            # this case
+            floor = height - height % _BAND - _BAND
+        else:
+            return (self.__class__, (self.data, self.edges))
+
+        return (
+            _unpickle,
+            (
+                _band_postorder(self, floor),
+                self.__class__,
+                self.data,
+                self.edges,
+            ),
+        )
 
-            if cursor_lhs.is_root() or cursor_rhs.is_root():
-                return False
+    def __copy__(self) -> Self:
+        return self
 
     def replace(self, **kwargs) -> Self:
         """
@@ -217,40 +274,299 @@ class Node(Generic[NodeData, EdgeData]):
         after = self.edges[index + 1 :]
         return self.replace(edges=before + after)
 
+    @property
+    def size(self) -> int:
+        """
+        Number of nodes in this subtree.
+
+        Subtrees repeated in several places are counted each time they appear.
+        This value is computed in linear time on first access, then cached.
+        """
+        if self._stats is None:
+            _compute_stats(self)
+
+        return self._stats[0]
+
+    @property
+    def height(self) -> int:
+        """
+        Number of edges on the longest path from this node to a leaf.
+
+        This value is computed in linear time on first access, then cached.
+        """
+        if self._stats is None:
+            _compute_stats(self)
+
+        return self._stats[1]
+
+    @property
+    def leaf_count(self) -> int:
+        """
+        Number of leaves in this subtree.
+
+        Subtrees repeated in several places are counted each time they appear.
+        This value is computed in linear time on first access, then cached.
+        """
+        if self._stats is None:
+            _compute_stats(self)
+
+        return self._stats[2]
+
     def unzip(self) -> Zipper:
         """Make a zipper for this subtree pointing on its root."""
         return Zipper(self)
 
+    def at(self, path: Iterable[int]) -> Zipper:
+        """
+        Make a zipper pointing on a node of this subtree.
+
+        Complexity: O(d), with d the length of the path.
+
+        :param path: sequence of child indices leading from this node to the
+            node to point on, as returned by :meth:`Zipper.path`
+        :raises IndexError: if the path does not exist in this subtree
+        :returns: zipper pointing on the node
+        """
+        cursor = self.unzip()
+
+        for index in path:
+            cursor = cursor.down(index)
+
+        return cursor
+
+    def at_all(self, paths: Iterable[tuple[int, ...]]) -> list[Zipper]:
+        """
+        Make zippers pointing on several nodes of this subtree.
+
+        Common prefixes of the paths are only walked once, and the returned
+        zippers share their common ancestors.
+
+        Complexity: O(k log k + m), with k the number of paths and m the
+        number of distinct nonempty path prefixes.
+
+        :param paths: sequences of child indices, as returned by
+            :meth:`Zipper.path`
+        :raises IndexError: if any path does not exist in this subtree
+        :returns: zipper pointing on the node of each path, in the same order
+        """
+        paths = [tuple(path) for path in paths]
+        result: list[Zipper] = [None] * len(paths)
+
+        # Zippers pointing on each prefix of the last visited path
+        cursors = [self.unzip()]
+        last: tuple[int, ...] = ()
+
+        for position in sorted(range(len(paths)), key=paths.__getitem__):
+            path = paths[position]
+            common = 0
+            limit = min(len(path), len(last))
+
+            while common < limit and path[common] == last[common]:
+                common += 1
+
+            del cursors[common + 1 :]
+
+            for index in path[common:]:
+                cursors.append(cursors[-1].down(index))
+
+            result[position] = cursors[-1]
+            last = path
+
+        return result
+
+    def edit_all(
+        self,
+        edits: Iterable[tuple[tuple[int, ...] | Zipper, Callable[[Zipper], Zipper]]],
+    ) -> Self | None:
+        """
+        Apply transformations to several nodes of this subtree at once.
+
+        Each transformation is a callback receiving a zipper pointing on a
+        node and returning an updated zipper, whose node and data replace the
+        pointed node and the data on its incoming edge. Returning a zipper
+        with no node removes the pointed node.
+
+        Transformations are applied from the bottom up, so that a node
+        receives the result of the transformations of its descendants. Nodes
+        are designated by their position in the original tree, which is not
+        affected by other edits. Ancestors of the transformed nodes are
+        rebuilt only once, however many edits lie below them. The zippers
+        passed to callbacks point on nodes whose descendants are already
+        edited, but their parents refer to the original tree.
+
+        Complexity: O(k log k + m), with k the number of edits and m the
+        number of distinct nonempty path prefixes, plus the cost of rebuilding
+        the edited nodes.
+
+        :param edits: sequence of pairs made of a path (as returned by
+            :meth:`Zipper.path`) or a zipper on this subtree pointing on the
+            node to transform, and of the transformation callback; edits
+            targeting the same node are applied in the given order
+        :raises IndexError: if any path does not exist in this subtree
+        :returns: edited subtree, or None if its root was removed
+        """
+        transforms: dict[tuple[int, ...], list[Callable[[Zipper], Zipper]]] = {}
+
+        for target, transform in edits:
+            if isinstance(target, Zipper):
+                target = target.path()
+            else:
+                target = tuple(target)
+
+                # Resolve negative indices to the positions they designate
+                if any(index < 0 for index in target):
+                    target = self.at(target).path()
+
+            transforms.setdefault(target, []).append(transform)
+
+        # Zipper pointing on each prefix of the last visited path, with the
+        # updated edges of its node, indexed by child position (None for
+        # removed children)
+        frames: list[tuple[Zipper, dict[int, Edge | None]]] = [(self.unzip(), {})]
+        last: tuple[int, ...] = ()
+
+        def finish() -> tuple[Self | None, Any]:
+            """Rebuild the node of the deepest frame and transform it."""
+            cursor, changes = frames.pop()
+            node = cursor.node
+            data = cursor.data
+
+            if changes:
+                edges = []
+
+                for index, edge in enumerate(node.edges):
+                    edge = changes.get(index, edge)
+
+                    if edge is not None:
+                        edges.append(edge)
+
+                node = node.replace(edges=tuple(edges))
+
+            path = last[: len(frames)]
+
+            for transform in transforms.get(path, ()):
+                cursor = transform(
+                    cursor._make(node, data, cursor.index, cursor.depth, cursor.parent)
+                )
+                node = cursor.node
+                data = cursor.data
+
+                if node is None:
+                    break
+
+            return node, data
+
+        def attach(node: Self | None, data: Any) -> None:
+            """Replace the deepest pending node in its parent."""
+            index = len(frames)
+            cursor, changes = frames[-1]
+            position = last[index - 1]
+            edge = cursor.node.edges[position]
+
+            if node is None:
+                changes[position] = None
+            elif node is not edge.node or data is not edge.data:
+                changes[position] = replace(edge, node=node, data=data)
+
+        for path in sorted(transforms):
+            common = 0
+            limit = min(len(path), len(last))
+
+            while common < limit and path[common] == last[common]:
+                common += 1
+
+            while len(frames) > common + 1:
+                attach(*finish())
+
+            for index in path[common:]:
+                frames.append((frames[-1][0].down(index), {}))
+
+            last = path
+
+        while len(frames) > 1:
+            attach(*finish())
+
+        return finish()[0]
+
     def children(self) -> Iterable[Self]:
         """Iterate through the children of this node."""
         for edge in self.edges:
             yield edge.node
 
-    def _str(
+    def _lines(
         self,
-        seen: Set[Self],
         prefix: str,
         chars: Mapping[str, str],
         highlight: Self | None,
-    ) -> str:
-        if self.data is None:
-            result = [chars["root"]] if self.edges and not self == highlight else [""]
-        elif isinstance(self.data, Mapping):
-            result = [str(dict(self.data))]
-        else:
-            result = [str(self.data)]
+        max_depth: int | None,
+        max_children: int | None,
+    ) -> Iterator[str]:
+        """Generate the lines of the human-readable representation."""
+        seen: set[Self] = set()
+
+        # Nodes left to render, with the text preceding the first line of each
+        # node, the line describing its incoming edge if any, the prefix of
+        # the lines of its subtree, and its depth; or elision markers, with
+        # only their line set
+        stack: list[tuple[Self | None, str, str | None, str, int]] = [
+            (self, "", None, prefix, 0)
+        ]
+
+        while stack:
+            node, head, branch, prefix, depth = stack.pop()
+
+            if branch is not None:
+                yield branch
+
+            if node is None:
+                yield head
+                continue
+
+            if node.data is None:
+                label = chars["root"] if node.edges and not node == highlight else ""
+            elif isinstance(node.data, Mapping):
+                label = str(dict(node.data))
+            else:
+                label = str(node.data)
 
-        if self is highlight:
-            result[0] = chars["highlight"] + result[0]
+            if node is highlight:
+                label = chars["highlight"] + label
 
-        if self in seen and self.edges:
-            result[0] = result[0] + chars["repeat"]
-        else:
-            seen.add(self)
-            init = chars["init"]
-            cont = chars["cont"]
+            if not node.edges:
+                yield head + label
+                continue
+
+            if node in seen:
+                yield head + label + chars["repeat"]
+                continue
+
+            yield head + label
+            seen.add(node)
+            edges = node.edges
+
+            if max_depth is not None and depth >= max_depth:
+                elided = len(edges)
+                edges = ()
+            elif max_children is not None and len(edges) > max_children:
+                elided = len(edges) - max_children
+                edges = edges[:max_children]
+            else:
+                elided = 0
+
+            if elided:
+                line = prefix + chars["init_last"] + chars["elide"] + f" {elided} more"
+                stack.append((None, line, None, prefix, depth + 1))
+
+            for index in reversed(range(len(edges))):
+                edge = edges[index]
+
+                if index + 1 == len(edges) and not elided:
+                    init = chars["init_last"]
+                    cont = chars["cont_last"]
+                else:
+                    init = chars["init"]
+                    cont = chars["cont"]
 
-            for index, edge in enumerate(self.edges):
                 if isinstance(edge.data, Mapping):
                     branch = str(dict(edge.data))
                 elif edge.data is not None:
@@ -258,22 +574,70 @@ class Node(Generic[NodeData, EdgeData]):
                 else:
                     branch = ""
 
-                if branch:
-                    result.append(prefix + cont + chars["branch"] + branch)
+                stack.append(
+                    (
+                        edge.node,
+                        prefix + init,
+                        (
+                            prefix + chars["cont"] + chars["branch"] + branch
+                            if branch
+                            else None
+                        ),
+                        prefix + cont,
+                        depth + 1,
+                    )
+                )
 
-                if index + 1 == len(self.edges):
-                    init = chars["init_last"]
-                    cont = chars["cont_last"]
+    def render(
+        self,
+        file: TextIO | None = None,
+        prefix: str = "",
+        chars: Mapping[str, str] = {},
+        highlight: Self | None = None,
+        max_depth: int | None = None,
+        max_children: int | None = None,
+        max_lines: int | None = None,
+    ) -> str | None:
+        """
+        Create a human-readable representation of this subtree.
+
+        Large trees can be summarized by limiting the rendered depth, number
+        of children per node, or number of lines. Parts of the tree left out
+        because of these limits are replaced with an elision marker.
+
+        :param file: if not None, text file to which the lines of the
+            representation are written as they are generated
+        :param prefix: text added at the start of each line except the first
+        :param chars: characters used to draw the tree, overriding the
+            defaults in :data:`STR_CHARS`
+        :param highlight: node to mark in the representation
+        :param max_depth: if not None, depth below which nodes are elided
+        :param max_children: if not None, maximum number of children to
+            render for each node, remaining children being elided
+        :param max_lines: if not None, maximum number of lines to render,
+            the last one being replaced with an elision marker if the tree
+            does not fit
+        :returns: rendered representation, or None if written to a file
+        """
+        chars = STR_CHARS | chars
+        lines = self._lines(prefix, chars, highlight, max_depth, max_children)
 
-                subtree = edge.node._str(
-                    prefix=prefix + cont,
-                    seen=seen,
-                    chars=chars,
-                    highlight=highlight,
-                )
-                result.append(prefix + init + subtree)
+        if max_lines is not None:
+            lines = islice(lines, max_lines + 1)
+            head = list(islice(lines, max_lines))
+
+            if head and next(lines, None) is not None:
+                head[-1] = (prefix if len(head) > 1 else "") + chars["elide"]
+
+            lines = iter(head)
 
-        return "\n".join(result)
+        if file is None:
+            return "\n".join(lines)
+
+        for line in lines:
+            file.write(line + "\n")
+
+        return None
 
     def __str__(
         self,
@@ -282,21 +646,119 @@ class Node(Generic[NodeData, EdgeData]):
         highlight: Self | None = None,
     ) -> str:
         """Create a human-readable representation of this subtree."""
-        return self._str(
-            seen=set(),
-            prefix=prefix,
-            chars=(
-                {
-                    "root": "┐",
-                    "branch": "╭",
-                    "init": "├──",
-                    "cont": "│  ",
-                    "init_last": "└──",
-                    "cont_last": "   ",
-                    "highlight": "○ ",
-                    "repeat": " (…)",
-                }
-                | chars
-            ),
-            highlight=highlight,
-        )
+        return self.render(prefix=prefix, chars=chars, highlight=highlight)
+
+
+# Default characters used to draw trees
+STR_CHARS = {
+    "root": "┐",
+    "branch": "╭",
+    "init": "├──",
+    "cont": "│  ",
+    "init_last": "└──",
+    "cont_last": "   ",
+    "highlight": "○ ",
+    "repeat": " (…)",
+    "elide": "…",
+}
+
+
+def _compute_hashes(root: Node) -> None:
+    """
+    Compute the hash of a node and of all its descendants that were not
+    hashed yet, from the bottom up to avoid deep recursion.
+    """
+    stack = [(root, False)]
+
+    while stack:
+        node, expanded = stack.pop()
+
+        if node._hash is not None:
+            continue
+
+        if expanded:
+            object.__setattr__(node, "_hash", hash((node.data, node.edges)))
+        else:
+            stack.append((node, True))
+            stack.extend(
+                (edge.node, False) for edge in node.edges if edge.node._hash is None
+            )
+
+
+def _compute_stats(root: Node) -> None:
+    """
+    Compute the size, height and number of leaves of a node and of all its
+    descendants for which they were not computed yet, from the bottom up.
+    """
+    stack = [(root, False)]
+
+    while stack:
+        node, expanded = stack.pop()
+
+        if node._stats is not None:
+            continue
+
+        if not node.edges:
+            object.__setattr__(node, "_stats", (1, 0, 1))
+        elif expanded:
+            size = 1
+            height = 0
+            leaf_count = 0
+
+            for edge in node.edges:
+                child_size, child_height, child_leaf_count = edge.node._stats
+                size += child_size
+                height = max(height, child_height + 1)
+                leaf_count += child_leaf_count
+
+            object.__setattr__(node, "_stats", (size, height, leaf_count))
+        else:
+            stack.append((node, True))
+            stack.extend(
+                (edge.node, False) for edge in node.edges if edge.node._stats is None
+            )
+
+
+# Number of levels pickled recursively between nodes whose descendants
+# are pickled bottom-up
+_BAND = 16
+
+
+def _band_level(height: int) -> int:
+    """Get the number of times a node height is divisible by :data:`_BAND`."""
+    level = 0
+
+    while height and height % _BAND == 0:
+        height //= _BAND
+        level += 1
+
+    return level
+
+
+def _band_postorder(root: Node, floor: int) -> list[Node]:
+    """List the descendants of a node down to a given height, in postorder."""
+    result = []
+    seen = set()
+    stack = [(edge.node, False) for edge in reversed(root.edges)]
+
+    while stack:
+        node, expanded = stack.pop()
+
+        if expanded:
+            result.append(node)
+        elif id(node) not in seen and node.height >= floor:
+            seen.add(id(node))
+            stack.append((node, True))
+            stack.extend((edge.node, False) for edge in reversed(node.edges))
+
+    return result
+
+
+def _unpickle(
+    descendants: list[Node],
+    cls: type[Node],
+    data: Any,
+    edges: tuple[Edge, ...],
+) -> Node:
+    """Rebuild a node pickled after its descendants."""
+    return cls(data, edges)
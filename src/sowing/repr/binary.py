@@ -0,0 +1,390 @@
+from array import array
+from collections.abc import Iterable
+from itertools import accumulate, chain, pairwise
+import pickle
+import struct
+import sys
+from typing import Any, BinaryIO, Hashable, TypeVar
+from immutables import Map
+from ..node import Node, Edge
+from ..util.keys import exact_key
+from ..util.postorder import flatten, unflatten
+
+NodeData = TypeVar("NodeData", bound=Hashable)
+EdgeData = TypeVar("EdgeData", bound=Hashable)
+
+# Layout of the binary format
+#
+# A serialized sequence of trees is made up of the following sections,
+# with all integers stored in little-endian byte order:
+#
+# 1. A header made of the magic bytes b"SOWB", the format version on one
+#    byte, the type of the integers stored in each of the three following
+#    sections on one byte each, then the number of operations, the number of
+#    distinct nodes and the size in bytes of the data table, each on 8 bytes.
+#    Integer types are given as array type codes: "b", "h" or "i" for signed
+#    integers on 1, 2 or 4 bytes, and "B", "H" or "I" for unsigned integers.
+# 2. The operations, as signed integers. Trees are listed one after the
+#    other, each in postorder. A non-negative operation creates a new node
+#    whose children are the given number of last nodes on the stack, and
+#    pushes it. A negative operation -(i + 1) pushes the i-th node created
+#    so far again, which lets shared subtrees be stored only once.
+# 3. For each created node, the index of its data in the data table, as
+#    unsigned integers.
+# 4. For each operation, the index of the data attached to the edge leading to
+#    the pushed node in the data table, as unsigned integers (the edges pushed
+#    for tree roots are attached to None).
+# 5. The data table, which lists the distinct values attached to nodes and
+#    edges. It is a pickled tuple made of the kind of each value, on one byte
+#    each (0 for strings, 1 for immutable maps, 2 for other values), the
+#    concatenation of all strings, the length of each string, the number of
+#    items of each map, the indices in the table of the keys and values of
+#    each map, alternated, and the list of other values. Maps only refer to
+#    values that precede them in the table.
+#
+# After executing all operations, the stack contains the root of each tree.
+#
+# Since the data table is pickled, only load data from trusted sources.
+_MAGIC = b"SOWB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sBcccQQQ")
+_SIGNED = "bhi"
+_UNSIGNED = "BHI"
+
+
+def _narrow(values: Iterable[int], typecodes: str) -> array:
+    """Store integers using the smallest type that can represent them."""
+    if not isinstance(values, array):
+        values = array("q", values)
+
+    low = min(values, default=0)
+    high = max(values, default=0)
+
+    for typecode in typecodes:
+        limit = 1 << (8 * array(typecode).itemsize - (typecode in _SIGNED))
+
+        if high < limit and (low >= 0 or -low <= limit):
+            break
+
+    return array(typecode, values)
+
+
+def _to_bytes(values: array, typecodes: str) -> tuple[bytes, bytes]:
+    """Encode integers using the smallest type that can represent them."""
+    values = _narrow(values, typecodes)
+
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values.typecode.encode(), values.tobytes()
+
+
+def _from_bytes(typecode: bytes, data: memoryview) -> memoryview | array:
+    """Decode integers of a given type, without copying them if possible."""
+    if sys.byteorder == "little":
+        return data.cast(typecode.decode())
+
+    values = array(typecode.decode())
+    values.frombytes(data)
+    values.byteswap()
+    return values
+
+
+# Kinds of values in the data table
+_STR = 0
+_MAP = 1
+_OTHER = 2
+
+
+def _load_table(data: bytes) -> list[Any]:
+    """Decode a table of data values."""
+    kinds, text, lengths, sizes, pairs, others = pickle.loads(data)
+    ends = accumulate(lengths)
+    strings = (text[start:end] for start, end in pairwise(chain((0,), ends)))
+    sizes = iter(sizes)
+    others = iter(others)
+    values = []
+    pos = 0
+
+    for kind in kinds:
+        if kind == _STR:
+            values.append(next(strings))
+        elif kind == _MAP:
+            end = pos + 2 * next(sizes)
+            values.append(
+                Map(
+                    zip(
+                        map(values.__getitem__, pairs[pos:end:2]),
+                        map(values.__getitem__, pairs[pos + 1 : end : 2]),
+                    )
+                )
+            )
+            pos = end
+        else:
+            values.append(next(others))
+
+    return values
+
+
+def _item_size(typecode: bytes) -> int:
+    if typecode.decode("ascii", "replace") not in _SIGNED + _UNSIGNED:
+        raise ValueError(f"invalid integer type {typecode!r} in tree data")
+
+    return array(typecode.decode()).itemsize
+
+
+def dumps_all(trees: Iterable[Node[NodeData, EdgeData]]) -> bytes:
+    """
+    Encode a sequence of trees into a binary string.
+
+    Nodes appearing several times, either inside a tree or in different
+    trees, are only stored once. Equal data values are also only stored once.
+
+    :param trees: trees to encode
+    :returns: encoded trees
+    """
+    # Data table, as described above
+    kinds = bytearray()
+    strings: list[str] = []
+    sizes: list[int] = []
+    pairs: list[int] = []
+    others: list[Hashable] = []
+
+    # Index of each distinct value in the data table, by a key telling apart
+    # equal values of different types: strings are their own keys, maps with
+    # other values than strings are keyed by the indices of their items, and
+    # other values by their exact key
+    keys: dict[Hashable, int] = {}
+
+    # Index of each map made only of strings, by the map itself, which is
+    # much faster than looking at its items
+    plain: dict[Map, int] = {}
+
+    def index(value: Hashable) -> int:
+        kind = type(value)
+
+        if kind is str:
+            if (position := keys.get(value)) is None:
+                position = keys[value] = len(kinds)
+                kinds.append(_STR)
+                strings.append(value)
+
+            return position
+
+        if kind is Map:
+            if (position := plain.get(value)) is not None:
+                return position
+
+            start = len(pairs)
+            strings_only = True
+
+            for item in chain.from_iterable(value.items()):
+                if type(item) is not str:
+                    strings_only = False
+                    position = index(item)
+                elif (position := keys.get(item)) is None:
+                    position = index(item)
+
+                pairs.append(position)
+
+            if strings_only:
+                # No equal map was seen before
+                position = plain[value] = len(kinds)
+            else:
+                content = tuple(pairs[start:])
+
+                if (position := keys.get(content)) is not None:
+                    del pairs[start:]
+                    return position
+
+                position = keys[content] = len(kinds)
+
+            kinds.append(_MAP)
+            sizes.append((len(pairs) - start) // 2)
+            return position
+
+        key = exact_key(value)
+
+        if (position := keys.get(key)) is None:
+            position = keys[key] = len(kinds)
+            kinds.append(_OTHER)
+            others.append(value)
+
+        return position
+
+    ops, nodes, edges = flatten(trees)
+    node_data = array("I", map(index, nodes))
+    edge_data = array("I", map(index, edges))
+    table = pickle.dumps(
+        (
+            bytes(kinds),
+            "".join(strings),
+            _narrow(map(len, strings), _UNSIGNED),
+            _narrow(sizes, _UNSIGNED),
+            _narrow(pairs, _UNSIGNED),
+            others,
+        ),
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+
+    ops_type, ops_bytes = _to_bytes(ops, _SIGNED)
+    node_type, node_bytes = _to_bytes(node_data, _UNSIGNED)
+    edge_type, edge_bytes = _to_bytes(edge_data, _UNSIGNED)
+
+    return b"".join(
+        (
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                ops_type,
+                node_type,
+                edge_type,
+                len(ops),
+                len(node_data),
+                len(table),
+            ),
+            ops_bytes,
+            node_bytes,
+            edge_bytes,
+            table,
+        )
+    )
+
+
+def _decode_all(data: memoryview, exact: bool) -> list[Node[NodeData, EdgeData]]:
+    """
+    Decode a sequence of trees from a buffer.
+
+    :param data: buffer containing encoded trees
+    :param exact: if False, allow unused bytes after the encoded trees
+    :returns: decoded trees
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated tree data")
+
+    (
+        magic,
+        version,
+        ops_type,
+        node_type,
+        edge_type,
+        op_count,
+        node_count,
+        table_size,
+    ) = _HEADER.unpack_from(data)
+
+    if magic != _MAGIC:
+        raise ValueError("not an encoded tree")
+
+    if version != _VERSION:
+        raise ValueError(f"unsupported tree encoding version {version}")
+
+    pos = _HEADER.size
+    sizes = (
+        _item_size(ops_type) * op_count,
+        _item_size(node_type) * node_count,
+        _item_size(edge_type) * op_count,
+        table_size,
+    )
+
+    if len(data) < pos + sum(sizes) or (exact and len(data) > pos + sum(sizes)):
+        raise ValueError("truncated tree data")
+
+    # Views on the input buffer, released at the end so that the buffer
+    # can be closed even if decoding fails
+    views = []
+
+    try:
+        for size in sizes:
+            views.append(data[pos : pos + size])
+            pos += size
+
+        ops, node_view, edge_view, table_view = views
+        table = _load_table(table_view)
+        views.append(ops := _from_bytes(ops_type, ops))
+        views.append(node_view := _from_bytes(node_type, node_view))
+        views.append(edge_view := _from_bytes(edge_type, edge_view))
+        node_data = map(table.__getitem__, node_view)
+        edge_data = map(table.__getitem__, edge_view)
+
+        return unflatten(ops, node_data, edge_data, Node, Edge)
+    finally:
+        for view in reversed(views):
+            if isinstance(view, memoryview):
+                view.release()
+
+
+def loads_all(data: bytes) -> list[Node[NodeData, EdgeData]]:
+    """
+    Decode a sequence of trees from a binary string.
+
+    :param data: encoded trees
+    :returns: decoded trees
+    """
+    with memoryview(data) as view:
+        return _decode_all(view, exact=True)
+
+
+def dumps(tree: Node[NodeData, EdgeData]) -> bytes:
+    """
+    Encode a tree into a binary string.
+
+    :param tree: tree to encode
+    :returns: encoded tree
+    """
+    return dumps_all((tree,))
+
+
+def loads(data: bytes) -> Node[NodeData, EdgeData]:
+    """
+    Decode a tree from a binary string.
+
+    :param data: encoded tree
+    :returns: decoded tree
+    """
+    trees = loads_all(data)
+
+    if len(trees) != 1:
+        raise ValueError(f"expected a single encoded tree, got {len(trees)}")
+
+    return trees[0]
+
+
+def dump(tree: Node[NodeData, EdgeData], file: BinaryIO) -> None:
+    """
+    Encode a tree into a binary file.
+
+    :param tree: tree to encode
+    :param file: binary file object to write to
+    """
+    file.write(dumps(tree))
+
+
+def load(file: BinaryIO) -> Node[NodeData, EdgeData]:
+    """
+    Decode a tree from a binary file.
+
+    :param file: binary file object to read from
+    :returns: decoded tree
+    """
+    return loads(file.read())
+
+
+def dump_all(trees: Iterable[Node[NodeData, EdgeData]], file: BinaryIO) -> None:
+    """
+    Encode a sequence of trees into a binary file.
+
+    :param trees: trees to encode
+    :param file: binary file object to write to
+    """
+    file.write(dumps_all(trees))
+
+
+def load_all(file: BinaryIO) -> list[Node[NodeData, EdgeData]]:
+    """
+    Decode a sequence of trees from a binary file.
+
+    :param file: binary file object to read from
+    :returns: decoded trees
+    """
+    return loads_all(file.read())
@@ -71,10 +71,7 @@ def write[NodeData, EdgeData](
     lines.extend(serialize_props(graph_style))
 
     # Traverse the graph, skipping repeated subtrees
-    for cursor in traversal.depth(root, preorder=True, unique="id"):
-        source = cursor.node
-        assert source is not None
-
+    for source in traversal.nodes(root, preorder=True, unique="id"):
         lines.append(f"{seq_id(source)}{serialize_style(node_style(source))}")
 
         for edge in source.edges:
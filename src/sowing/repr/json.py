@@ -1,5 +1,7 @@
-from typing import Any, Callable, Hashable, TypeVar
-from json import JSONEncoder
+from collections.abc import Iterator
+from typing import Any, Callable, Hashable, TextIO, TypeVar
+from json import JSONDecoder, JSONDecodeError, JSONEncoder
+import re
 from ..node import Node, Edge
 
 NodeData = TypeVar("NodeData", bound=Hashable)
@@ -7,10 +9,88 @@ EdgeData = TypeVar("EdgeData", bound=Hashable)
 
 
 class TreeEncoder(JSONEncoder):
+    def __init__(self, *args, refs: bool = False, **kwargs):
+        """
+        Create a tree encoder.
+
+        Trees are encoded using an explicit stack instead of recursion, so
+        that there is no limit on their depth, and :func:`json.dump` writes
+        them to files piece by piece. Options that change the layout of the
+        output (indent and sort_keys) fall back to the standard recursive
+        encoder.
+
+        :param refs: if True, give each distinct node an "id" key the first
+            time it is encoded and replace its later occurrences with a
+            {"ref": id} object, so that shared subtrees are encoded only once
+        """
+        super().__init__(*args, **kwargs)
+        self.refs = refs
+        self._ids: dict[int, tuple[int, Node]] = {}
+
+    def iterencode(self, value, _one_shot=False):
+        if (
+            isinstance(value, (Node, Edge))
+            and self.indent is None
+            and not self.sort_keys
+        ):
+            return self._iterencode_tree(value)
+
+        self._ids = {}
+        return super().iterencode(value, _one_shot)
+
+    def _iterencode_tree(self, value: Node | Edge) -> Iterator[str]:
+        """Generate the pieces of the encoding of a tree, in order."""
+        sep = self.item_separator
+        key = self.key_separator
+        stack: list[Node | Edge | str] = [value]
+
+        # Identifier of each encoded node, keeping the nodes alive
+        ids: dict[int, tuple[int, Node]] = {}
+
+        while stack:
+            item = stack.pop()
+
+            match item:
+                case str():
+                    yield item
+
+                case Node(data, edges):
+                    if self.refs:
+                        if (known := ids.get(id(item))) is not None:
+                            yield f'{{"ref"{key}{known[0]}}}'
+                            continue
+
+                        ident = len(ids)
+                        ids[id(item)] = (ident, item)
+                        yield f'{{"id"{key}{ident}{sep}"edges"{key}['
+                    else:
+                        yield f'{{"edges"{key}['
+
+                    stack.append(f']{sep}"data"{key}{self.encode(data)}}}')
+
+                    for index in range(len(edges) - 1, -1, -1):
+                        stack.append(edges[index])
+
+                        if index:
+                            stack.append(sep)
+
+                case Edge(node, data):
+                    yield f'{{"node"{key}'
+                    stack.append(f'{sep}"data"{key}{self.encode(data)}}}')
+                    stack.append(node)
+
     def default(self, value):
         match value:
             case Node(data, edges):
-                return {"edges": edges, "data": data}
+                if not self.refs:
+                    return {"edges": edges, "data": data}
+
+                if (known := self._ids.get(id(value))) is not None:
+                    return {"ref": known[0]}
+
+                ident = len(self._ids)
+                self._ids[id(value)] = (ident, value)
+                return {"id": ident, "edges": edges, "data": data}
 
             case Edge(node, data):
                 return {"node": node, "data": data}
@@ -22,33 +102,307 @@ def passthrough(value):
     return value
 
 
+def _build(
+    members: dict,
+    node_decoder: Callable[[Any], NodeData],
+    edge_decoder: Callable[[Any], EdgeData],
+    nodes: dict[Any, Node[NodeData, EdgeData]] | None,
+    edges: tuple[Edge[NodeData, EdgeData], ...] = (),
+) -> Node[NodeData, EdgeData] | Edge[NodeData, EdgeData]:
+    """Build a node or an edge from the members of its JSON object."""
+    if nodes is not None and "ref" in members:
+        if members["ref"] not in nodes:
+            raise ValueError(f"reference to unknown node {members['ref']!r}")
+
+        return nodes[members["ref"]]
+
+    if "edges" in members:
+        node = Node(edges=edges, data=node_decoder(members.get("data")))
+
+        if nodes is not None and "id" in members:
+            nodes[members["id"]] = node
+
+        return node
+
+    if "node" in members:
+        return Edge(node=members["node"], data=edge_decoder(members.get("data")))
+
+    raise TypeError(
+        "value is neither a node with an 'edges' key nor"
+        f" an edge with a 'node' key; got keys {list(members.keys())}"
+    )
+
+
 def tree_decoder(
     value: dict,
     node_decoder: Callable[[Any], NodeData] = passthrough,
     edge_decoder: Callable[[Any], EdgeData] = passthrough,
+    refs: bool = False,
 ) -> Node[NodeData, EdgeData] | Edge[NodeData, EdgeData]:
-    if not isinstance(value, dict):
-        raise TypeError("value must be a dict, got {type(value)}")
-
-    if "edges" in value:
-        if not isinstance(value["edges"], list):
-            raise TypeError("node edges must be a list, got {type(value['edges'])}")
-
-        return Node(
-            edges=tuple(
-                tree_decoder(item, node_decoder, edge_decoder)
-                for item in value["edges"]
-            ),
-            data=node_decoder(value.get("data")),
-        )
+    """
+    Decode a tree from its JSON representation.
+
+    :param value: decoded JSON object representing a node or an edge
+    :param node_decoder: function used to decode the data attached to nodes
+    :param edge_decoder: function used to decode the data attached to edges
+    :param refs: if True, decode {"ref": id} objects as references to the
+        previously decoded node with the same "id" key, as produced by
+        :class:`TreeEncoder` in references mode
+    :returns: decoded node or edge
+    """
+    nodes = {} if refs else None
+
+    # Objects left to decode, and whether their children are already decoded
+    stack = [(value, False)]
+    results = []
+
+    while stack:
+        value, expanded = stack.pop()
+
+        if expanded:
+            if "edges" in value:
+                if count := len(value["edges"]):
+                    edges = tuple(results[-count:])
+                    del results[-count:]
+                else:
+                    edges = ()
+
+                results.append(_build(value, node_decoder, edge_decoder, nodes, edges))
+            else:
+                members = {"node": results.pop(), "data": value.get("data")}
+                results.append(_build(members, node_decoder, edge_decoder, nodes))
+
+            continue
+
+        if not isinstance(value, dict):
+            raise TypeError("value must be a dict, got {type(value)}")
+
+        if nodes is not None and "ref" in value:
+            results.append(_build(value, node_decoder, edge_decoder, nodes))
+        elif "edges" in value:
+            if not isinstance(value["edges"], list):
+                raise TypeError("node edges must be a list, got {type(value['edges'])}")
+
+            stack.append((value, True))
+            stack.extend((item, False) for item in reversed(value["edges"]))
+        elif "node" in value:
+            stack.append((value, True))
+            stack.append((value["node"], False))
+        else:
+            _build(value, node_decoder, edge_decoder, nodes)
+
+    return results[0]
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = JSONDecoder()
+
+
+class _Reader:
+    """Buffered reader for JSON tokens from a text file."""
+
+    __slots__ = [
+        "file",
+        "chunk_size",
+        "buffer",
+        "pos",
+        "offset",
+        "lines",
+        "line_start",
+        "final",
+    ]
 
-    if "node" in value:
-        return Edge(
-            node=tree_decoder(value["node"], node_decoder, edge_decoder),
-            data=edge_decoder(value.get("data")),
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+
+        # Position of the buffer start in the file
+        self.offset = 0
+
+        # Number of lines before the buffer start, and position in the file
+        # of the line containing it
+        self.lines = 0
+        self.line_start = 0
+
+        # Whether the end of the file was reached
+        self.final = False
+
+    def error(self, message: str, pos: int | None = None) -> JSONDecodeError:
+        """Create an error located at a position of the buffer."""
+        pos = self.pos if pos is None else pos
+        error = JSONDecodeError(message, self.buffer, pos)
+
+        # Locate the error relative to the whole file
+        error.pos = self.offset + pos
+        error.lineno = self.lines + self.buffer.count("\n", 0, pos) + 1
+
+        if (newline := self.buffer.rfind("\n", 0, pos)) != -1:
+            error.colno = pos - newline
+        else:
+            error.colno = error.pos - self.line_start + 1
+
+        error.args = (
+            f"{message}: line {error.lineno} column {error.colno} (char {error.pos})",
         )
+        return error
 
-    raise TypeError(
-        "value is neither a node with an 'edges' key nor"
-        f" an edge with a 'node' key; got keys {list(value.keys())}"
-    )
+    def fill(self) -> bool:
+        """Read more data from the file, returning False at its end."""
+        if self.final:
+            return False
+
+        chunk = self.file.read(self.chunk_size)
+
+        if not chunk:
+            self.final = True
+            return False
+
+        self.lines += self.buffer.count("\n", 0, self.pos)
+
+        if (newline := self.buffer.rfind("\n", 0, self.pos)) != -1:
+            self.line_start = self.offset + newline + 1
+
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and get the next character, or "" at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume an expected character."""
+        if self.peek() != char:
+            raise self.error(f"Expecting {char!r}")
+
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Consume any JSON value."""
+        self.peek()
+
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+
+                # Values ending with the buffer may continue after it
+                if end < len(self.buffer) or self.final:
+                    self.pos = end
+                    return value
+            except JSONDecodeError as error:
+                if self.final:
+                    raise self.error(error.msg, error.pos) from None
+
+            self.fill()
+
+
+def load(
+    file: TextIO,
+    node_decoder: Callable[[Any], NodeData] = passthrough,
+    edge_decoder: Callable[[Any], EdgeData] = passthrough,
+    refs: bool = False,
+    chunk_size: int = 1 << 16,
+) -> Node[NodeData, EdgeData] | Edge[NodeData, EdgeData]:
+    """
+    Decode a tree from a JSON text file.
+
+    The file is read in chunks, and the tree is built bottom-up using an
+    explicit stack, so that there is no limit on its depth. Only the data
+    attached to nodes and edges is decoded using the standard JSON decoder.
+
+    :param file: text file object to read from
+    :param node_decoder: function used to decode the data attached to nodes
+    :param edge_decoder: function used to decode the data attached to edges
+    :param refs: if True, decode {"ref": id} objects as references to the
+        previously decoded node with the same "id" key, as produced by
+        :class:`TreeEncoder` in references mode
+    :param chunk_size: number of characters to read at once
+    :returns: decoded node or edge
+    """
+    reader = _Reader(file, chunk_size)
+    nodes = {} if refs else None
+
+    # Members of each open object or items of each open list, whether the
+    # next member or item is the first one, and the key of the open member
+    stack: list[list] = []
+    reader.expect("{")
+    stack.append([{}, True, None])
+
+    while True:
+        frame = stack[-1]
+        container = frame[0]
+        char = reader.peek()
+
+        if isinstance(container, dict):
+            if char == "}":
+                reader.pos += 1
+                stack.pop()
+                value = _build(
+                    container,
+                    node_decoder,
+                    edge_decoder,
+                    nodes,
+                    container.get("edges", ()),
+                )
+            else:
+                if not frame[1]:
+                    reader.expect(",")
+
+                frame[1] = False
+
+                if not isinstance(key := reader.value(), str):
+                    raise reader.error("Expecting property name")
+
+                reader.expect(":")
+                frame[2] = key
+
+                if key == "edges":
+                    if reader.peek() != "[":
+                        value = reader.value()
+                        raise TypeError(f"node edges must be a list, got {type(value)}")
+
+                    reader.pos += 1
+                    stack.append([[], True, None])
+                elif key == "node":
+                    reader.expect("{")
+                    stack.append([{}, True, None])
+                else:
+                    container[key] = reader.value()
+
+                continue
+        else:
+            if char == "]":
+                reader.pos += 1
+                stack.pop()
+                value = tuple(container)
+            else:
+                if not frame[1]:
+                    reader.expect(",")
+
+                frame[1] = False
+                reader.expect("{")
+                stack.append([{}, True, None])
+                continue
+
+        if not stack:
+            if reader.peek() != "":
+                raise reader.error("Extra data")
+
+            return value
+
+        parent = stack[-1]
+
+        if isinstance(parent[0], dict):
+            parent[0][parent[2]] = value
+        else:
+            parent[0].append(value)
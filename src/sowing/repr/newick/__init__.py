@@ -1,2 +1,13 @@
-from .parse import parse, parse_all, ParseError
-from .write import write
+from .parse import (
+    parse,
+    parse_all,
+    ParseError,
+    Schema,
+    SharingTable,
+    tokenize,
+    tokenize_regex,
+)
+from .index import NewickIndex
+from .parallel import parse_all_parallel
+from .stream import iter_parse
+from .write import write, write_all
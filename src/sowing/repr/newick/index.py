@@ -0,0 +1,189 @@
+from array import array
+from collections.abc import Iterator
+from os import PathLike, stat
+import mmap
+from immutables import Map
+from sowing.node import Node
+from .parse import (
+    tokenize_regex,
+    Lexer,
+    ParseError,
+    Schema,
+    _iter_trees,
+    _skip_whitespace,
+)
+from .stream import Splitter
+
+# Sidecar files start with the size and modification time of the indexed file,
+# followed by the offsets of the tree boundaries
+_SIDECAR_HEADER = 2
+
+
+def _file_stamp(path: str | PathLike) -> tuple[int, int]:
+    """Get the size and modification time of a file."""
+    info = stat(path)
+    return info.st_size, info.st_mtime_ns
+
+
+def _scan(path: str | PathLike) -> array:
+    """Find the boundaries of the trees contained in a file."""
+    bounds = array("Q", [0])
+
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return bounds
+
+    with data:
+        splitter = Splitter()
+
+        while (end := splitter.find(data)) is not None:
+            bounds.append(end)
+
+        if _skip_whitespace(data, bounds[-1]) < len(data):
+            # Last tree is not terminated by a semicolon
+            bounds.append(len(data))
+
+    return bounds
+
+
+def _load_sidecar(path: str | PathLike, sidecar: str | PathLike) -> array | None:
+    """Read tree boundaries from a sidecar file, if it is up to date."""
+    try:
+        with open(sidecar, "rb") as file:
+            contents = array("Q", file.read())
+    except (OSError, ValueError):
+        return None
+
+    if len(contents) <= _SIDECAR_HEADER:
+        return None
+
+    if tuple(contents[:_SIDECAR_HEADER]) != _file_stamp(path):
+        return None
+
+    return contents[_SIDECAR_HEADER:]
+
+
+def _save_sidecar(path: str | PathLike, sidecar: str | PathLike, bounds: array):
+    """Write tree boundaries to a sidecar file."""
+    with open(sidecar, "wb") as file:
+        array("Q", _file_stamp(path)).tofile(file)
+        bounds.tofile(file)
+
+
+class NewickIndex:
+    """
+    Index of the positions of the trees contained in a Newick file.
+
+    Building an index only scans the file for the semicolons that end each
+    tree, without parsing any tree. Trees can then be accessed at random by
+    their position in the file, and only the requested trees are parsed.
+    """
+
+    __slots__ = ["path", "lexer", "schema", "_bounds"]
+
+    def __init__(
+        self,
+        path: str | PathLike,
+        bounds: array,
+        lexer: Lexer = tokenize_regex,
+        schema: Schema | None = None,
+    ):
+        """
+        Create an index from known tree boundaries.
+
+        :param path: path to the indexed file
+        :param bounds: starting offset of each tree in the file, followed by
+            the offset where the last tree ends
+        :param lexer: tokenizer used to split the input into tokens
+        :param schema: if not None, schema used to build node and edge data
+            instead of property maps
+        """
+        self.path = path
+        self.lexer = lexer
+        self.schema = schema
+        self._bounds = bounds
+
+    @classmethod
+    def build(
+        cls,
+        path: str | PathLike,
+        sidecar: str | PathLike | None = None,
+        lexer: Lexer = tokenize_regex,
+        schema: Schema | None = None,
+    ) -> "NewickIndex":
+        """
+        Index the trees contained in a Newick file.
+
+        :param path: path to the file to index
+        :param sidecar: if not None, path to a file in which the index is
+            saved; if this file already exists and is up to date with the
+            indexed file, the index is loaded from it instead of being rebuilt
+        :param lexer: tokenizer used to split the input into tokens
+        :param schema: if not None, schema used to build node and edge data
+            instead of property maps
+        :returns: built index
+        """
+        bounds = None
+
+        if sidecar is not None:
+            bounds = _load_sidecar(path, sidecar)
+
+        if bounds is None:
+            bounds = _scan(path)
+
+            if sidecar is not None:
+                _save_sidecar(path, sidecar, bounds)
+
+        return cls(path, bounds, lexer, schema)
+
+    def __len__(self) -> int:
+        return len(self._bounds) - 1
+
+    def _parse_range(self, start: int, stop: int) -> list[Node[Map, Map]]:
+        """Parse a range of consecutive trees."""
+        if start >= stop:
+            return []
+
+        base = self._bounds[start]
+
+        with open(self.path, "rb") as file:
+            file.seek(base)
+            data = file.read(self._bounds[stop] - base)
+
+        try:
+            return list(_iter_trees(data, self.lexer, schema=self.schema))
+        except ParseError as error:
+            raise error.shift(base) from None
+
+    def __getitem__(self, key: int | slice) -> Node[Map, Map] | list[Node[Map, Map]]:
+        """
+        Parse the tree at a given position, or a list of trees.
+
+        :param key: index of the tree to parse, or slice of trees to parse
+        :returns: parsed tree or list of parsed trees
+        """
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+
+            if step == 1:
+                return self._parse_range(start, stop)
+
+            return [
+                self._parse_range(index, index + 1)[0]
+                for index in range(start, stop, step)
+            ]
+
+        if key < 0:
+            key += len(self)
+
+        if not 0 <= key < len(self):
+            raise IndexError("tree index out of range")
+
+        return self._parse_range(key, key + 1)[0]
+
+    def __iter__(self) -> Iterator[Node[Map, Map]]:
+        for index in range(len(self)):
+            yield self[index]
@@ -0,0 +1,134 @@
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from os import PathLike, cpu_count
+import mmap
+from immutables import Map
+from sowing.node import Node, Edge
+from sowing.util.postorder import flatten, unflatten
+from .parse import (
+    tokenize_regex,
+    Lexer,
+    ParseError,
+    Schema,
+    SharingTable,
+    _iter_trees,
+    _sharing_table,
+)
+from .stream import Splitter
+
+# Compact representation of a sequence of trees used to transfer them between
+# processes: the operations, node data and edge data produced by
+# :func:`sowing.util.postorder.flatten`
+Packed = tuple[array, list, list]
+
+
+def _pack(trees: Iterable[Node]) -> Packed:
+    """Flatten a sequence of trees into a compact representation."""
+    return flatten(trees)
+
+
+def _unpack(packed: Packed, table: SharingTable | None = None) -> list[Node]:
+    """Rebuild a sequence of trees from its compact representation."""
+    if table is None:
+        return unflatten(*packed, Node, Edge)
+
+    def make_node(data, edges):
+        return table.node(table.value(data) if data is not None else None, edges)
+
+    def make_edge(node, data):
+        return table.edge(node, table.value(data) if data is not None else None)
+
+    return unflatten(*packed, make_node, make_edge)
+
+
+def _parse_batch(
+    path: str | PathLike,
+    start: int,
+    end: int,
+    lexer: Lexer,
+    schema: Schema | None,
+) -> Packed:
+    """Parse the trees contained in a range of a file."""
+    with open(path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    try:
+        return _pack(_iter_trees(data, lexer, schema=schema))
+    except ParseError as error:
+        raise error.shift(start) from None
+
+
+def _split_batches(path: str | PathLike, batch_size: int) -> Iterator[tuple[int, int]]:
+    """Split a file into ranges of consecutive trees of a given minimum size."""
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return
+
+    with data:
+        splitter = Splitter()
+        start = 0
+
+        while (end := splitter.find(data)) is not None:
+            if end - start >= batch_size:
+                yield start, end
+                start = end
+
+        if start < len(data):
+            yield start, len(data)
+
+
+def parse_all_parallel(
+    path: str | PathLike,
+    workers: int | None = None,
+    batch_size: int = 1 << 20,
+    lexer: Lexer = tokenize_regex,
+    share: bool | SharingTable = False,
+    schema: Schema | None = None,
+) -> Iterator[Node[Map, Map]]:
+    """
+    Parse a file containing a sequence of Newick trees using multiple processes.
+
+    The file is split on the semicolons that end each tree, and consecutive
+    trees are grouped in batches that are parsed in a pool of worker processes.
+    Parsed trees are sent back in a flattened form, which is cheaper to
+    transfer than nested nodes.
+
+    :param path: path to the file to parse
+    :param workers: number of worker processes to use
+        (default: number of processors on the machine)
+    :param batch_size: minimum number of bytes in each batch of trees
+    :param lexer: tokenizer used to split the input into tokens
+    :param share: pass True to share repeated property maps and subtrees
+        between all parsed trees, or a sharing table to also share them with
+        other trees parsed using the same table
+    :param schema: if not None, schema used to build node and edge data
+        instead of property maps; it must be picklable to be sent to workers
+    :returns: generator that yields each parsed tree in its original order
+    """
+    table = _sharing_table(share)
+
+    if workers is None:
+        workers = cpu_count() or 1
+
+    # Limit the number of pending batches to bound memory usage
+    window = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque[Future[Packed]] = deque()
+
+        for start, end in _split_batches(path, batch_size):
+            pending.append(
+                executor.submit(_parse_batch, path, start, end, lexer, schema)
+            )
+
+            if len(pending) >= window:
+                yield from _unpack(pending.popleft().result(), table)
+
+        while pending:
+            yield from _unpack(pending.popleft().result(), table)
@@ -1,23 +1,34 @@
-from typing import Any, Iterator
+from typing import Any, Callable, Iterable, Iterator
 from collections import deque
+from collections.abc import Buffer
+import re
 from enum import Enum, auto
 from dataclasses import dataclass
 from immutables import Map
-from sowing.node import Node
+from sowing.node import Node, Edge
 
 
 class ParseError(Exception):
     """Parsing error with location information."""
 
     def __init__(self, message, start, end):
+        self.message = message
+        self.start = start
+        self.end = end
+
         if abs(start - end) <= 1:
             message = f"{message} (at position {start})"
         else:
             message = f"{message} (at range {start}-{end})"
 
         super().__init__(message)
-        self.start = start
-        self.end = end
+
+    def __reduce__(self):
+        return (self.__class__, (self.message, self.start, self.end))
+
+    def shift(self, offset: int) -> "ParseError":
+        """Create a copy of this error with its location moved by an offset."""
+        return ParseError(self.message, self.start + offset, self.end + offset)
 
 
 class TokenKind(Enum):
@@ -52,7 +63,7 @@ class PropStyle(Enum):
     BEAST = auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Token:
     """Token emitted by the lexer."""
 
@@ -72,6 +83,9 @@ class Token:
 # Class of characters that ignored by the lexer
 WHITESPACE = " \t\n"
 
+# Newick input, either as a string or as a binary buffer of UTF-8 data
+Data = str | Buffer
+
 
 def _lex_whitespace(data: str, pos: int) -> int:
     """Advance past whitespace in a Newick string."""
@@ -86,7 +100,6 @@ def _lex_comment(data: str, pos: int) -> int:
     start = pos
     pos += 1
     depth = 1
-    contents = "["
 
     while pos < len(data) and depth > 0:
         if data[pos] == "]":
@@ -94,7 +107,6 @@ def _lex_comment(data: str, pos: int) -> int:
         elif data[pos] == "[":
             depth += 1
 
-        contents += data[pos]
         pos += 1
 
     if depth > 0:
@@ -114,6 +126,7 @@ def _lex_quoted_string(data: str, pos: int) -> tuple[Token, int]:
             if pos + 1 < len(data) and data[pos + 1] == "'":
                 contents += "'"
                 pos += 2
+                continue
             else:
                 break
 
@@ -130,8 +143,7 @@ def _lex_quoted_string(data: str, pos: int) -> tuple[Token, int]:
 def _lex_unquoted_string(data: str, state: PropStyle, pos: int) -> tuple[Token, int]:
     """Extract a token for a plain unquoted string."""
     start = pos
-    contents = data[pos]
-    pos += 1
+    contents = ""
 
     match state:
         case PropStyle.Normal:
@@ -159,9 +171,17 @@ def _lex_unquoted_string(data: str, state: PropStyle, pos: int) -> tuple[Token,
     return Token(TokenKind.String, start, pos, contents), pos
 
 
-def tokenize(data: str) -> Iterator[Token]:
-    """Tokenize a Newick string."""
-    pos = 0
+def tokenize(data: str, pos: int = 0) -> Iterator[Token]:
+    """
+    Tokenize a Newick string, examining one character at a time.
+
+    Only string inputs are supported; use :func:`tokenize_regex`
+    to tokenize binary buffers in place. The parsing functions decode
+    binary inputs before passing them to this lexer.
+
+    :param data: input data stream
+    :param pos: position at which to start tokenizing
+    """
     state = PropStyle.Normal
     nhx_start = TokenKind.OpenPropsNHX
     beast_start = TokenKind.OpenPropsBEAST
@@ -183,12 +203,12 @@ def tokenize(data: str) -> Iterator[Token]:
             yield Token(TokenKind(cur), pos, pos + 1)
             pos += 1
 
-        elif data[pos:].startswith(nhx_start.value):
+        elif data.startswith(nhx_start.value, pos):
             state = PropStyle.NHX
             yield Token(nhx_start, pos, pos + len(nhx_start.value))
             pos += len(nhx_start.value)
 
-        elif data[pos:].startswith(beast_start.value):
+        elif data.startswith(beast_start.value, pos):
             state = PropStyle.BEAST
             yield Token(beast_start, pos, pos + len(beast_start.value))
             pos += len(beast_start.value)
@@ -215,6 +235,189 @@ def tokenize(data: str) -> Iterator[Token]:
     yield Token(TokenKind.End, pos, pos)
 
 
+# Patterns matching the next token in each lexer state, after any whitespace
+_LEX_SOURCES = {
+    PropStyle.Normal: (
+        r"[ \t\n]*+(?:(?P<string>[^()\[\],:;' \t\n]++)|(?P<token>[(),:;])"
+        r"|(?P<nhx>\[&&NHX)|(?P<beast>\[&)|(?P<comment>\[)|(?P<close>\])"
+        r"|(?P<quoted>')|(?P<end>\Z))"
+    ),
+    PropStyle.NHX: (
+        r"[ \t\n]*+(?:(?P<token>[:=])|(?P<nhx>\[&&NHX)|(?P<beast>\[&)"
+        r"|(?P<comment>\[)|(?P<close>\])|(?P<quoted>')"
+        r"|(?P<string>[^\[\]:= \t\n]++)|(?P<end>\Z))"
+    ),
+    PropStyle.BEAST: (
+        r"[ \t\n]*+(?:(?P<token>[,=])|(?P<nhx>\[&&NHX)|(?P<beast>\[&)"
+        r"|(?P<comment>\[)|(?P<close>\])|(?P<quoted>')"
+        r"|(?P<string>[^\[\],= \t\n]++)|(?P<end>\Z))"
+    ),
+}
+
+# Pattern matching a complete quoted string, with doubled quotes as escapes
+_LEX_QUOTED_SOURCE = r"'([^']*+(?:''[^']*+)*+)'"
+
+# Pattern matching the characters that open or close nested comments
+_LEX_COMMENT_SOURCE = r"(?P<open>\[)|\]"
+
+# Pattern matching any run of whitespace
+_LEX_WHITESPACE_SOURCE = r"[ \t\n]*"
+
+
+@dataclass(frozen=True, slots=True)
+class _LexTables:
+    """Compiled lexer patterns for a given type of input."""
+
+    tokens: dict[PropStyle, re.Pattern]
+    quoted: re.Pattern
+    comment: re.Pattern
+    whitespace: re.Pattern
+
+    @classmethod
+    def compile(cls, encode: Callable[[str], str | bytes]) -> "_LexTables":
+        return cls(
+            tokens={
+                state: re.compile(encode(source))
+                for state, source in _LEX_SOURCES.items()
+            },
+            quoted=re.compile(encode(_LEX_QUOTED_SOURCE)),
+            comment=re.compile(encode(_LEX_COMMENT_SOURCE)),
+            whitespace=re.compile(encode(_LEX_WHITESPACE_SOURCE)),
+        )
+
+
+_LEX_TEXT = _LexTables.compile(str)
+_LEX_BINARY = _LexTables.compile(str.encode)
+
+# Kinds of single-character tokens, indexed by character and by byte value
+_TOKEN_KINDS = {kind.value: kind for kind in TokenKind} | {
+    ord(kind.value): kind for kind in TokenKind if len(kind.value) == 1
+}
+
+
+def _lex_tables(data: Data) -> _LexTables:
+    """Get the lexer patterns matching the type of an input."""
+    return _LEX_TEXT if isinstance(data, str) else _LEX_BINARY
+
+
+def _skip_whitespace(data: Data, pos: int) -> int:
+    """Advance past whitespace in a Newick string or buffer."""
+    return _lex_tables(data).whitespace.match(data, pos).end()
+
+
+def _decode(value: str | bytes, start: int, end: int) -> str:
+    """Decode a value extracted from a Newick string or buffer."""
+    if isinstance(value, str):
+        return value
+
+    try:
+        return value.decode()
+    except UnicodeDecodeError as error:
+        raise ParseError("invalid UTF-8 data", start, end) from error
+
+
+def tokenize_regex(data: Data, pos: int = 0) -> Iterator[Token]:
+    """
+    Tokenize a Newick string or buffer using regular expressions.
+
+    This produces the same tokens and errors as :func:`tokenize`, but matches
+    each token as a whole instead of examining one character at a time.
+
+    Binary buffers (bytes, memoryview, mmap) are scanned in place, and only the
+    strings they contain are decoded from UTF-8. Positions in tokens and errors
+    are then byte offsets into the buffer.
+
+    :param data: input data stream
+    :param pos: position at which to start tokenizing
+    """
+    tables = _lex_tables(data)
+    state = PropStyle.Normal
+    pattern = tables.tokens[state]
+
+    while True:
+        match = pattern.match(data, pos)
+        kind = match.lastgroup
+        start = match.start(kind)
+        pos = match.end()
+
+        if kind == "string":
+            value = _decode(match.group(kind), start, pos)
+
+            if "_" in value:
+                value = value.replace("_", " ")
+
+            yield Token(TokenKind.String, start, pos, value)
+
+        elif kind == "token":
+            yield Token(_TOKEN_KINDS[data[start]], start, pos)
+
+        elif kind == "quoted":
+            if (quoted := tables.quoted.match(data, start)) is None:
+                raise ParseError("unclosed string", start, len(data))
+
+            pos = quoted.end()
+            value = _decode(quoted.group(1), start, pos)
+            yield Token(TokenKind.String, start, pos, value.replace("''", "'"))
+
+        elif kind == "comment":
+            depth = 1
+
+            while depth > 0:
+                if (bracket := tables.comment.search(data, pos)) is None:
+                    raise ParseError("unclosed comment", start, len(data))
+
+                depth += 1 if bracket.lastgroup == "open" else -1
+                pos = bracket.end()
+
+        elif kind == "nhx":
+            state = PropStyle.NHX
+            pattern = tables.tokens[state]
+            yield Token(TokenKind.OpenPropsNHX, start, pos)
+
+        elif kind == "beast":
+            state = PropStyle.BEAST
+            pattern = tables.tokens[state]
+            yield Token(TokenKind.OpenPropsBEAST, start, pos)
+
+        elif kind == "close":
+            if state == PropStyle.Normal:
+                raise ParseError("unexpected ']'", start, pos)
+
+            state = PropStyle.Normal
+            pattern = tables.tokens[state]
+            yield Token(TokenKind.CloseProps, start, pos)
+
+        else:
+            yield Token(TokenKind.End, start, start)
+            return
+
+
+# Tokenizer function, called with the input and a starting position. Binary
+# inputs are decoded before being tokenized by lexers other than
+# :func:`tokenize_regex`, which only accept strings
+Lexer = Callable[[Data, int], Iterator[Token]]
+
+
+def _decode_input(data: Data, lexer: Lexer) -> str | None:
+    """Decode a binary input if the given lexer cannot scan it in place."""
+    if isinstance(data, str) or lexer is tokenize_regex:
+        return None
+
+    try:
+        return str(data, "utf-8")
+    except UnicodeDecodeError as error:
+        raise ParseError("invalid UTF-8 data", error.start, error.end) from None
+
+
+def _byte_error(text: str, error: ParseError) -> ParseError:
+    """Move the location of an error in a decoded input to byte offsets."""
+    return ParseError(
+        error.message,
+        len(text[: error.start].encode()),
+        len(text[: error.end].encode()),
+    )
+
+
 class TokenIterator:
     """Token iterator with pushback."""
 
@@ -275,35 +478,246 @@ class ParseState(Enum):
     Finish = auto()
 
 
-def _parse_props_nhx(tokens: TokenIterator) -> Map:
-    """Parse a block of Newick properties in NHX format."""
-    result = {}
+class SharingTable:
+    """
+    Table of unique values, edges and nodes used to share the repeated parts
+    of parsed trees (hash-consing).
+
+    Equal labels and property maps are replaced with a single instance, and
+    each subtree equal to a previously seen one is replaced with that subtree.
+    Tables keep all the objects they have seen alive, and can be reused for
+    several trees to share parts between them.
+    """
+
+    __slots__ = ["_values", "_edges", "_nodes"]
+
+    def __init__(self):
+        self._values: dict[Any, Any] = {}
+        self._edges: dict[tuple[int, Any], Edge] = {}
+        self._nodes: dict[tuple[Any, tuple[int, ...]], Node] = {}
+
+    def value(self, value: Any) -> Any:
+        """Get the unique instance of a value."""
+        return self._values.setdefault(value, value)
+
+    def edge(self, node: Node, data: Any) -> Edge:
+        """Get the unique edge with given data leading to a unique node."""
+        key = (id(node), data)
+
+        if (edge := self._edges.get(key)) is None:
+            edge = self._edges[key] = Edge(node=node, data=data)
 
+        return edge
+
+    def node(self, data: Any, edges: Iterable[Edge]) -> Node:
+        """Get the unique node with given data and unique outgoing edges."""
+        edges = tuple(edges)
+        key = (data, tuple(map(id, edges)))
+
+        if (node := self._nodes.get(key)) is None:
+            node = self._nodes[key] = Node(data=data, edges=edges)
+
+        return node
+
+
+def _sharing_table(share: "bool | SharingTable") -> SharingTable | None:
+    """Create a sharing table if needed."""
+    if isinstance(share, SharingTable):
+        return share
+
+    return SharingTable() if share else None
+
+
+def _keep(value: Any) -> Any:
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Schema:
+    """
+    Description of the data attached to parsed nodes and edges.
+
+    By default, the parser stores the properties of each node and edge as
+    maps of strings. A schema instead builds records directly from the parsed
+    properties, converting their values on the fly, which avoids rebuilding
+    the tree afterwards to get typed data. Records are always built, even for
+    nodes and edges without any property.
+    """
+
+    # Record type for node data, called with the node properties as keywords
+    # (including "name" for the node label)
+    clade: Callable[..., Any] = Map
+
+    # Record type for edge data, called with the edge properties as keywords
+    # (including "length", "support" and "probability")
+    branch: Callable[..., Any] = Map
+
+    # Functions used to convert the string value of each property
+    converters: Map = Map()
+
+    def _convert(self, props: dict[str, str]) -> dict[str, Any]:
+        if self.converters:
+            for key, value in props.items():
+                if (convert := self.converters.get(key)) is not None:
+                    props[key] = convert(value)
+
+        return props
+
+    def make_clade(self, props: dict[str, str]) -> Any:
+        """Build the data attached to a node from its properties."""
+        return self.clade(**self._convert(props))
+
+    def make_branch(self, props: dict[str, str]) -> Any:
+        """Build the data attached to an edge from its properties."""
+        return self.branch(**self._convert(props))
+
+
+# Suffix of labels that tag shared nodes in the Extended Newick notation
+_NETWORK_TAG = re.compile(r"#((?:H|LGT|R)?[0-9]+)\Z")
+
+
+class _NetworkLinks:
+    """Shared nodes of a tree encoded in the Extended Newick notation."""
+
+    __slots__ = ["definitions", "references"]
+
+    def __init__(self):
+        # Node bearing the subtree of each tag
+        self.definitions: dict[str, Node] = {}
+
+        # Leaves referring to a tag before its subtree was known, with the
+        # location of their label
+        self.references: dict[int, tuple[Node, str, Token]] = {}
+
+    def visit(self, tag: str, node: Node, label: Token) -> Node:
+        """Register a tagged node and get the node that should replace it."""
+        definition = self.definitions.get(tag)
+
+        if node.edges:
+            if definition is not None and definition.edges:
+                raise ParseError(
+                    f"duplicate definition of shared node '#{tag}'",
+                    label.start,
+                    label.end,
+                )
+
+            self.definitions[tag] = node
+            return node
+
+        if definition is not None and definition.edges:
+            return definition
+
+        if definition is None:
+            definition = self.definitions[tag] = node
+
+        # Leaves are provisionally shared until a subtree is found
+        self.references[id(definition)] = (definition, tag, label)
+        return definition
+
+    def resolve(self, root: Node) -> Node:
+        """Replace references to subtrees defined after them."""
+        if all(
+            self.definitions[tag] is node for node, tag, _ in self.references.values()
+        ):
+            return root
+
+        done: dict[int, Node] = {}
+        visiting = set()
+        stack = [(root, False)]
+
+        while stack:
+            node, expanded = stack.pop()
+            key = id(node)
+
+            if key in done:
+                continue
+
+            if (reference := self.references.get(key)) is not None:
+                target = self.definitions[reference[1]]
+
+                if target is node:
+                    reference = None
+
+            if expanded:
+                visiting.discard(key)
+
+                if reference is not None:
+                    done[key] = done[id(target)]
+                else:
+                    edges = tuple(
+                        Edge(node=done[id(edge.node)], data=edge.data)
+                        for edge in node.edges
+                    )
+
+                    if all(new.node is old.node for new, old in zip(edges, node.edges)):
+                        done[key] = node
+                    else:
+                        done[key] = Node(data=node.data, edges=edges)
+            else:
+                if reference is not None and id(target) in visiting:
+                    _, tag, label = reference
+                    raise ParseError(
+                        f"shared node '#{tag}' contains itself",
+                        label.start,
+                        label.end,
+                    )
+
+                visiting.add(key)
+                stack.append((node, True))
+
+                if reference is not None:
+                    stack.append((target, False))
+                else:
+                    stack.extend((edge.node, False) for edge in node.edges)
+
+        return done[id(root)]
+
+
+def _split_tag(clade: dict[str, str], intern: Callable[[str], str]) -> str | None:
+    """Remove the Extended Newick tag from a node label, if any."""
+    if (match := _NETWORK_TAG.search(clade["name"])) is None:
+        return None
+
+    if name := clade["name"][: match.start()]:
+        clade["name"] = intern(name)
+    else:
+        del clade["name"]
+
+    return match.group(1)
+
+
+def _parse_props_nhx(
+    tokens: TokenIterator,
+    result: dict[str, str],
+    intern: Callable[[str], str] = _keep,
+) -> None:
+    """Parse a block of Newick properties in NHX format."""
     while tokens.extract(TokenKind.Colon) is not None:
-        key = tokens.expect(TokenKind.String).value
+        key = intern(tokens.expect(TokenKind.String).value)
         tokens.expect(TokenKind.Equals)
 
         if (token := tokens.extract(TokenKind.String)) is not None:
-            value = token.value
+            value = intern(token.value)
         else:
             value = ""
 
         result[key] = value
 
     tokens.expect(TokenKind.CloseProps)
-    return Map(result)
 
 
-def _parse_props_beast(tokens: TokenIterator) -> Map:
+def _parse_props_beast(
+    tokens: TokenIterator,
+    result: dict[str, str],
+    intern: Callable[[str], str] = _keep,
+) -> None:
     """Parse a block of Newick properties in BEAST format."""
-    result = {}
-
     while (token := tokens.extract(TokenKind.String)) is not None:
-        key = token.value
+        key = intern(token.value)
         tokens.expect(TokenKind.Equals)
 
         if (token := tokens.extract(TokenKind.String)) is not None:
-            value = token.value
+            value = intern(token.value)
         else:
             value = ""
 
@@ -311,39 +725,60 @@ def _parse_props_beast(tokens: TokenIterator) -> Map:
         tokens.skip(TokenKind.Comma)
 
     tokens.expect(TokenKind.CloseProps)
-    return Map(result)
 
 
-def _parse_props(tokens: TokenIterator) -> tuple[Map]:
-    """Parse a block of Newick properties."""
+def _parse_props(
+    tokens: TokenIterator,
+    result: dict[str, str],
+    intern: Callable[[str], str] = _keep,
+) -> None:
+    """Parse a block of Newick properties, if any, and add them to a dict."""
     match (start := next(tokens)).kind:
         case TokenKind.OpenPropsNHX:
-            return _parse_props_nhx(tokens)
+            _parse_props_nhx(tokens, result, intern)
 
         case TokenKind.OpenPropsBEAST:
-            return _parse_props_beast(tokens)
+            _parse_props_beast(tokens, result, intern)
 
         case _:
             tokens.push(start)
-            return Map()
 
 
-def parse_chain(data: str) -> tuple[Node, int]:
+def parse_chain(
+    data: Data,
+    start: int = 0,
+    lexer: Lexer = tokenize_regex,
+    table: SharingTable | None = None,
+    schema: Schema | None = None,
+    network: bool = False,
+) -> tuple[Node, int]:
     """
-    Chainable parser for single trees encoded as Newick strings.
+    Chainable parser for single trees encoded as Newick strings or buffers.
 
     :param data: input data stream
+    :param start: position at which the tree starts in the string
+    :param lexer: tokenizer used to split the input into tokens
+    :param table: if not None, table used to share repeated labels,
+        property maps and subtrees
+    :param schema: if not None, schema used to build node and edge data
+        instead of property maps
+    :param network: if True, decode labels tagged using the Extended Newick
+        notation (such as "#H1") as references to a single shared node
     :return: parsed tree and ending position in the string
     """
-    nodes = []
-    tokens = TokenIterator(tokenize(data))
+    intern = table.value if table is not None else _keep
+    links = _NetworkLinks() if network else None
+
+    # Outgoing edges of each node being parsed, from the root to the active node
+    children = []
+    tokens = TokenIterator(lexer(data, start))
     state = ParseState.NodeStart
 
     while state != ParseState.Finish:
         match state:
             case ParseState.NodeStart:
                 # Start parsing a new node
-                nodes.append(Node())
+                children.append([])
 
                 if tokens.extract(TokenKind.OpenParen) is not None:
                     state = ParseState.NodeStart
@@ -352,45 +787,80 @@ def parse_chain(data: str) -> tuple[Node, int]:
 
             case ParseState.NodeData:
                 # Parse metadata attached to a node
-                clade = Map()
-                branch = Map()
+                clade = {}
+                branch = {}
+
+                if schema is not None:
+                    # Remember where the node data starts to report errors
+                    first = next(tokens)
+                    tokens.push(first)
 
                 # Parse node label
-                if (token := tokens.extract(TokenKind.String)) is not None:
-                    clade = clade.set("name", token.value)
+                if (label := tokens.extract(TokenKind.String)) is not None:
+                    clade["name"] = intern(label.value)
+
+                if links is not None and label is not None:
+                    tag = _split_tag(clade, intern)
+                else:
+                    tag = None
 
                 # Parse node props
-                clade = clade.update(_parse_props(tokens))
+                _parse_props(tokens, clade, intern)
 
                 if tokens.extract(TokenKind.Colon) is not None:
                     # Parse branch length
                     if (token := tokens.extract(TokenKind.String)) is not None:
-                        branch = branch.set("length", token.value)
+                        branch["length"] = intern(token.value)
 
                     # Parse branch support
                     if tokens.extract(TokenKind.Colon) is not None:
                         if (token := tokens.extract(TokenKind.String)) is not None:
-                            branch = branch.set("support", token.value)
+                            branch["support"] = intern(token.value)
 
                     # Parse branch probability
                     if tokens.extract(TokenKind.Colon) is not None:
                         if (token := tokens.extract(TokenKind.String)) is not None:
-                            branch = branch.set("probability", token.value)
+                            branch["probability"] = intern(token.value)
 
                     # Parse other branch props
-                    branch = branch.update(_parse_props(tokens))
+                    _parse_props(tokens, branch, intern)
+
+                if schema is None:
+                    clade = intern(Map(clade)) if clade else None
+                    branch = intern(Map(branch)) if branch else None
+                else:
+                    try:
+                        clade = intern(schema.make_clade(clade))
+                        branch = intern(schema.make_branch(branch))
+                    except (TypeError, ValueError) as error:
+                        token = next(tokens)
+                        raise ParseError(
+                            f"invalid node data ({error})",
+                            first.start,
+                            token.start,
+                        ) from None
+
+                if table is None or tag is not None:
+                    # Tagged nodes are kept out of the sharing table, since
+                    # nodes with distinct tags must stay distinct objects
+                    active = Node(data=clade, edges=tuple(children.pop()))
+                else:
+                    active = table.node(clade, children.pop())
 
-                active = nodes.pop()
-                active = active.replace(data=clade or None)
+                if tag is not None:
+                    active = links.visit(tag, active, label)
 
-                if not nodes:
+                if not children:
                     # Finished parsing the root node
                     state = ParseState.Finish
-                    nodes.append(active)
                 else:
                     # Attach parsed node to its parent
-                    parent = nodes.pop()
-                    nodes.append(parent.add(active, data=branch or None))
+                    if table is None:
+                        edge = Edge(node=active, data=branch)
+                    else:
+                        edge = table.edge(active, branch)
+
+                    children[-1].append(edge)
 
                     match (token := next(tokens)).kind:
                         case TokenKind.Comma:
@@ -415,26 +885,96 @@ def parse_chain(data: str) -> tuple[Node, int]:
             token.end,
         )
 
-    return nodes.pop(), token.end
+    if links is not None:
+        active = links.resolve(active)
+
+    return active, token.end
 
 
-def parse(data: str) -> Node[Map, Map]:
-    """Parse a single tree encoded as a Newick string."""
-    node, pos = parse_chain(data)
+def parse(
+    data: Data,
+    lexer: Lexer = tokenize_regex,
+    share: bool | SharingTable = False,
+    schema: Schema | None = None,
+    network: bool = False,
+) -> Node[Map, Map]:
+    """
+    Parse a single tree encoded as a Newick string or buffer.
 
-    if data[pos:].strip(WHITESPACE):
+    :param data: input data stream
+    :param lexer: tokenizer used to split the input into tokens
+    :param share: pass True to share repeated labels, property maps and
+        subtrees inside the parsed tree, or a sharing table to also share
+        them with other trees parsed using the same table
+    :param schema: if not None, schema used to build node and edge data
+        instead of property maps
+    :param network: if True, decode labels tagged using the Extended Newick
+        notation (such as "#H1") as references to a single shared node
+    :return: parsed tree
+    """
+    if (text := _decode_input(data, lexer)) is not None:
+        try:
+            return parse(text, lexer, share, schema, network)
+        except ParseError as error:
+            raise _byte_error(text, error) from None
+
+    node, pos = parse_chain(
+        data,
+        lexer=lexer,
+        table=_sharing_table(share),
+        schema=schema,
+        network=network,
+    )
+
+    if _skip_whitespace(data, pos) < len(data):
         raise ParseError("unexpected garbage after end of tree", pos, len(data))
 
     return node
 
 
-def parse_all(data: str) -> list[Node[Map, Map]]:
-    """Parse a sequence of trees encoded as Newick strings."""
-    result = []
+def _iter_trees(
+    data: Data,
+    lexer: Lexer,
+    table: SharingTable | None = None,
+    schema: Schema | None = None,
+    network: bool = False,
+) -> Iterator[Node[Map, Map]]:
+    """Lazily parse a sequence of trees encoded as Newick strings or buffers."""
+    if (text := _decode_input(data, lexer)) is not None:
+        try:
+            yield from _iter_trees(text, lexer, table, schema, network)
+        except ParseError as error:
+            raise _byte_error(text, error) from None
+
+        return
+
+    pos = 0
+
+    while _skip_whitespace(data, pos) < len(data):
+        node, pos = parse_chain(data, pos, lexer, table, schema, network)
+        yield node
 
-    while data.strip(WHITESPACE):
-        node, pos = parse_chain(data)
-        result.append(node)
-        data = data[pos:]
 
-    return result
+def parse_all(
+    data: Data,
+    lexer: Lexer = tokenize_regex,
+    share: bool | SharingTable = False,
+    schema: Schema | None = None,
+    network: bool = False,
+) -> list[Node[Map, Map]]:
+    """
+    Parse a sequence of trees encoded as Newick strings or buffers.
+
+    :param data: input data stream
+    :param lexer: tokenizer used to split the input into tokens
+    :param share: pass True to share repeated labels, property maps and
+        subtrees between all parsed trees, or a sharing table to also share
+        them with other trees parsed using the same table
+    :param schema: if not None, schema used to build node and edge data
+        instead of property maps
+    :param network: if True, decode labels tagged using the Extended Newick
+        notation (such as "#H1") as references to a single shared node
+    :return: list of parsed trees
+    """
+    table = _sharing_table(share)
+    return list(_iter_trees(data, lexer, table, schema, network))
@@ -0,0 +1,342 @@
+import re
+from collections.abc import Buffer, Iterator
+from dataclasses import dataclass
+from enum import Enum, auto
+from os import PathLike
+from typing import BinaryIO, TextIO
+from immutables import Map
+from sowing.node import Node
+from .parse import (
+    parse,
+    tokenize_regex,
+    Data,
+    Lexer,
+    ParseError,
+    PropStyle,
+    Schema,
+    SharingTable,
+    _iter_trees,
+    _sharing_table,
+    _skip_whitespace,
+)
+
+
+class ScanState(Enum):
+    """States for the tree boundary scanner."""
+
+    # Outside of any string, comment, or property block
+    Normal = auto()
+
+    # Inside a block of properties
+    Props = auto()
+
+    # Inside a (possibly nested) comment
+    Comment = auto()
+
+    # Inside a quoted string
+    Quoted = auto()
+
+
+@dataclass(frozen=True, slots=True)
+class _ScanTables:
+    """Compiled scanner patterns for a given type of input."""
+
+    # Characters that can change the scanner state, for each state
+    normal: re.Pattern
+    props: re.Pattern
+    comment: re.Pattern
+    quoted: re.Pattern
+
+    # Openings of property blocks
+    opening: re.Pattern
+
+    # Incomplete openings of property blocks at the end of the input
+    partial: re.Pattern
+
+    # Characters after which a quote starts a new string inside property blocks
+    breaks: dict[PropStyle, str | bytes]
+
+    @classmethod
+    def compile(cls, encode) -> "_ScanTables":
+        return cls(
+            normal=re.compile(encode(r"(?P<semicolon>;)|(?P<quote>')|(?P<open>\[)")),
+            props=re.compile(encode(r"(?P<close>\])|(?P<quote>')|(?P<open>\[)")),
+            comment=re.compile(encode(r"(?P<open>\[)|\]")),
+            quoted=re.compile(encode(r"''?")),
+            opening=re.compile(encode(r"(?P<nhx>\[&&NHX)|(?P<beast>\[&)")),
+            partial=re.compile(encode(r"\[(?:&(?:&(?:N(?:H)?)?)?)?\Z")),
+            breaks={
+                PropStyle.NHX: encode("[]:= \t\n"),
+                PropStyle.BEAST: encode("[],= \t\n"),
+            },
+        )
+
+
+_SCAN_TEXT = _ScanTables.compile(str)
+_SCAN_BINARY = _ScanTables.compile(str.encode)
+
+
+class Splitter:
+    """
+    Incremental scanner locating the boundaries of trees in a Newick stream.
+
+    The scanner only looks for top-level semicolons, skipping over quoted
+    strings, comments and property blocks the same way the lexer does,
+    without building any token or tree. It can be fed a stream piece by piece:
+    its state is kept between calls so that scanning resumes where it stopped.
+    Both strings and binary buffers are supported.
+    """
+
+    __slots__ = ["pos", "_state", "_resume", "_style", "_depth", "_boundary"]
+
+    def __init__(self):
+        # Position at which the next scan resumes
+        self.pos = 0
+
+        self._state = ScanState.Normal
+
+        # State to return to after the current string or comment
+        self._resume = ScanState.Normal
+
+        # Notation of the current property block
+        self._style = PropStyle.Normal
+
+        # Nesting level of the current comment
+        self._depth = 0
+
+        # Whether the next character of a property block starts a new token
+        self._boundary = False
+
+    def _open(
+        self,
+        tables: _ScanTables,
+        data: Data,
+        pos: int,
+        final: bool,
+    ) -> int | None:
+        """Advance past an opening bracket, or return None if undecidable yet."""
+        if not final and tables.partial.match(data, pos):
+            return None
+
+        if (opening := tables.opening.match(data, pos)) is not None:
+            self._state = ScanState.Props
+            self._boundary = True
+
+            if opening.lastgroup == "nhx":
+                self._style = PropStyle.NHX
+            else:
+                self._style = PropStyle.BEAST
+
+            return opening.end()
+
+        self._resume = self._state
+        self._state = ScanState.Comment
+        self._depth = 1
+        return pos + 1
+
+    def find(self, data: Data, final: bool = True) -> int | None:
+        """
+        Find the end of the next tree in a stream.
+
+        :param data: input data stream, scanned starting from :attr:`pos`
+        :param final: pass False if more data may be appended to the stream
+            later, in which case scanning stops before any construct that
+            cannot be decided without looking further
+        :returns: position following the next top-level semicolon, or None
+            if there is no complete tree left in the stream
+        """
+        tables = _SCAN_TEXT if isinstance(data, str) else _SCAN_BINARY
+        pos = self.pos
+        size = len(data)
+
+        while pos < size:
+            match self._state:
+                case ScanState.Normal:
+                    if (match := tables.normal.search(data, pos)) is None:
+                        pos = size
+                        break
+
+                    pos = match.start()
+
+                    if match.lastgroup == "semicolon":
+                        self.pos = pos + 1
+                        return self.pos
+
+                    if match.lastgroup == "quote":
+                        self._resume = ScanState.Normal
+                        self._state = ScanState.Quoted
+                        pos += 1
+                    elif (pos := self._open(tables, data, pos, final)) is None:
+                        pos = match.start()
+                        break
+
+                case ScanState.Props:
+                    breaks = tables.breaks[self._style]
+
+                    if (match := tables.props.search(data, pos)) is None:
+                        self._boundary = data[-1] in breaks
+                        pos = size
+                        break
+
+                    if match.start() > pos:
+                        self._boundary = data[match.start() - 1] in breaks
+
+                    pos = match.start()
+
+                    if match.lastgroup == "close":
+                        self._state = ScanState.Normal
+                        pos += 1
+                    elif match.lastgroup == "quote":
+                        if self._boundary:
+                            self._resume = ScanState.Props
+                            self._state = ScanState.Quoted
+
+                        self._boundary = False
+                        pos += 1
+                    elif (pos := self._open(tables, data, pos, final)) is None:
+                        pos = match.start()
+                        break
+
+                case ScanState.Comment:
+                    if (match := tables.comment.search(data, pos)) is None:
+                        pos = size
+                        break
+
+                    pos = match.end()
+
+                    if match.lastgroup == "open":
+                        self._depth += 1
+                    else:
+                        self._depth -= 1
+
+                        if self._depth == 0:
+                            self._state = self._resume
+                            self._boundary = True
+
+                case ScanState.Quoted:
+                    if (match := tables.quoted.search(data, pos)) is None:
+                        pos = size
+                        break
+
+                    if match.end() == size and not final:
+                        # Wait to know whether the quote is doubled
+                        pos = match.start()
+                        break
+
+                    pos = match.end()
+
+                    if match.end() - match.start() == 1:
+                        self._state = self._resume
+
+        self.pos = pos
+        return None
+
+
+def _parse_tree(
+    data: Data,
+    offset: int,
+    lexer: Lexer,
+    table: SharingTable | None,
+    schema: Schema | None,
+    network: bool,
+) -> Node[Map, Map]:
+    """Parse a single tree, reporting errors relative to the stream start."""
+    try:
+        return parse(
+            data,
+            lexer,
+            share=table or False,
+            schema=schema,
+            network=network,
+        )
+    except ParseError as error:
+        raise error.shift(offset) from None
+
+
+def _iter_parse_file(
+    file: TextIO | BinaryIO,
+    chunk_size: int,
+    lexer: Lexer,
+    table: SharingTable | None,
+    schema: Schema | None,
+    network: bool,
+) -> Iterator[Node[Map, Map]]:
+    splitter = Splitter()
+
+    # Current buffer and start position of the current tree inside it
+    data = file.read(chunk_size)
+    start = 0
+    final = not data
+
+    # Scanned parts of the current tree that precede the current buffer
+    pieces = []
+    empty = data[:0]
+
+    # Position in the stream of the buffer start and of the current tree start
+    offset = 0
+    tree_offset = 0
+
+    while True:
+        if (end := splitter.find(data, final)) is not None:
+            tree = empty.join(pieces) + data[start:end]
+            yield _parse_tree(tree, tree_offset, lexer, table, schema, network)
+            pieces.clear()
+            start = end
+            tree_offset = offset + end
+        elif not final:
+            chunk = file.read(chunk_size)
+            final = not chunk
+            pieces.append(data[start : splitter.pos])
+            data = data[splitter.pos :] + chunk
+            offset += splitter.pos
+            start = splitter.pos = 0
+        else:
+            rest = empty.join(pieces) + data[start:]
+
+            if _skip_whitespace(rest, 0) < len(rest):
+                yield _parse_tree(rest, tree_offset, lexer, table, schema, network)
+
+            return
+
+
+def iter_parse(
+    source: str | PathLike | TextIO | BinaryIO | Buffer,
+    chunk_size: int = 1 << 16,
+    lexer: Lexer = tokenize_regex,
+    share: bool | SharingTable = False,
+    schema: Schema | None = None,
+    network: bool = False,
+) -> Iterator[Node[Map, Map]]:
+    """
+    Lazily parse a sequence of trees encoded in the Newick format.
+
+    File inputs are read in chunks and each tree is parsed as soon as it is
+    complete, so that memory usage is bounded by the size of the largest
+    tree instead of the size of the whole input. Binary buffers, including
+    memory-mapped files, are parsed in place without being copied or decoded
+    as a whole.
+
+    :param source: path to a file (which is read in binary mode),
+        text or binary file object to read from, or binary buffer
+        (bytes, memoryview, mmap) containing UTF-8 data
+    :param chunk_size: number of characters or bytes to read at once
+    :param lexer: tokenizer used to split the input into tokens
+    :param share: pass True to share repeated labels, property maps and
+        subtrees between all parsed trees, or a sharing table to also share
+        them with other trees parsed using the same table
+    :param schema: if not None, schema used to build node and edge data
+        instead of property maps
+    :param network: if True, decode labels tagged using the Extended Newick
+        notation (such as "#H1") as references to a single shared node
+    :returns: generator that yields each parsed tree in order
+    """
+    table = _sharing_table(share)
+    options = (lexer, table, schema, network)
+
+    if isinstance(source, (str, PathLike)):
+        with open(source, "rb") as file:
+            yield from _iter_parse_file(file, chunk_size, *options)
+    elif isinstance(source, Buffer):
+        yield from _iter_trees(source, *options)
+    else:
+        yield from _iter_parse_file(source, chunk_size, *options)
@@ -1,7 +1,11 @@
+from collections.abc import Iterable, Iterator
+from io import TextIOBase
+from typing import BinaryIO, TextIO
 from immutables import Map
 from sowing.node import Node
-from sowing.zipper import Zipper
-from sowing import traversal
+
+# Number of characters accumulated before each write to an output file
+_FLUSH_SIZE = 1 << 16
 
 
 def quote_string(data: str) -> str:
@@ -25,22 +29,25 @@ def write_props(props: Map) -> str:
     )
 
 
-def write_node(cursor: Zipper[Map | None, Map | None]) -> Zipper[str, None]:
-    node = cursor.node
-    branch = cursor.data
+def _write_data(
+    clade: Map | None,
+    branch: Map | None,
+    tag: str | None = None,
+) -> str:
+    """Encode the data attached to a node and to its parent edge."""
+    data = ""
+    name = ""
 
-    if node.edges:
-        data = "(" + ",".join(edge.node.data for edge in node.edges) + ")"
-    else:
-        data = ""
+    if isinstance(clade, Map) and "name" in clade:
+        name = clade["name"]
+        clade = clade.delete("name")
 
-    clade = node.data
+    if tag is not None:
+        name += "#" + tag
 
-    if isinstance(clade, Map):
-        if "name" in clade:
-            data += quote_string(clade["name"])
-            clade = clade.delete("name")
+    data += quote_string(name)
 
+    if isinstance(clade, Map):
         data += write_props(clade)
 
     if isinstance(branch, Map) and branch:
@@ -62,9 +69,147 @@ def write_node(cursor: Zipper[Map | None, Map | None]) -> Zipper[str, None]:
         if all_props:
             data += ":" + all_props
 
-    return cursor.replace(node=Node(data), data=None)
+    return data
+
+
+def _find_shared(root: Node) -> set[int]:
+    """Find the identities of internal nodes reachable through several paths."""
+    seen = set()
+    shared = set()
+    stack = [root]
+
+    while stack:
+        for edge in stack.pop().edges:
+            if edge.node.edges:
+                key = id(edge.node)
+
+                if key in seen:
+                    shared.add(key)
+                else:
+                    seen.add(key)
+                    stack.append(edge.node)
 
+    return shared
 
-def write(root: Node[Map | None, Map | None]) -> str:
-    """Encode a tree into a Newick string."""
-    return traversal.fold(write_node, traversal.depth(root)).data + ";"
+
+def _write_fragments(
+    root: Node[Map | None, Map | None],
+    network: bool = False,
+) -> Iterator[str]:
+    """Generate the pieces of the Newick encoding of a tree, in order."""
+    # Pending nodes, with the data of their parent edge, and pending fragments
+    stack: list[tuple[Node, Map | None] | str] = [";", (root, None)]
+
+    # Tags assigned to shared nodes that have already been written
+    shared = _find_shared(root) if network else set()
+    tags: dict[int, str] = {}
+
+    while stack:
+        item = stack.pop()
+
+        if isinstance(item, str):
+            yield item
+            continue
+
+        node, branch = item
+        tag = None
+
+        if shared and (key := id(node)) in shared:
+            if key in tags:
+                # Refer to the previously written node
+                yield _write_data(None, branch, tags[key])
+                continue
+
+            tag = tags[key] = f"H{len(tags) + 1}"
+
+        if node.edges:
+            stack.append(")" + _write_data(node.data, branch, tag))
+            edges = node.edges
+
+            for index in range(len(edges) - 1, -1, -1):
+                stack.append((edges[index].node, edges[index].data))
+
+                if index:
+                    stack.append(",")
+
+            yield "("
+        else:
+            yield _write_data(node.data, branch)
+
+
+def _dump(fragments: Iterable[str], file: TextIO | BinaryIO) -> None:
+    """Write fragments to a text or binary file in batches."""
+    binary = not isinstance(file, TextIOBase)
+    batch = []
+    size = 0
+
+    for fragment in fragments:
+        batch.append(fragment)
+        size += len(fragment)
+
+        if size >= _FLUSH_SIZE:
+            data = "".join(batch)
+            file.write(data.encode() if binary else data)
+            batch.clear()
+            size = 0
+
+    if batch:
+        data = "".join(batch)
+        file.write(data.encode() if binary else data)
+
+
+def write(
+    root: Node[Map | None, Map | None],
+    file: TextIO | BinaryIO | None = None,
+    network: bool = False,
+) -> str | None:
+    """
+    Encode a tree into a Newick string.
+
+    The tree is encoded in a single pass, without building any intermediate
+    tree, so that the encoding time stays linear in the output size.
+
+    :param root: tree to encode
+    :param file: if not None, text or binary file object to which the
+        encoded tree is written (using UTF-8 for binary files) in pieces,
+        without ever holding the whole encoding in memory
+    :param network: if True, use the Extended Newick notation to write
+        internal nodes that are shared between several parents only once:
+        the first occurrence is tagged with a label such as "#H1", and
+        later occurrences are replaced with that label
+    :returns: encoded tree, or None if written to a file
+    """
+    if file is None:
+        return "".join(_write_fragments(root, network))
+
+    _dump(_write_fragments(root, network), file)
+
+
+def _write_all_fragments(
+    trees: Iterable[Node[Map | None, Map | None]],
+    network: bool,
+) -> Iterator[str]:
+    for tree in trees:
+        yield from _write_fragments(tree, network)
+        yield "\n"
+
+
+def write_all(
+    trees: Iterable[Node[Map | None, Map | None]],
+    file: TextIO | BinaryIO | None = None,
+    network: bool = False,
+) -> str | None:
+    """
+    Encode a sequence of trees into Newick strings, one tree per line.
+
+    :param trees: trees to encode
+    :param file: if not None, text or binary file object to which the
+        encoded trees are written (using UTF-8 for binary files) in pieces
+    :param network: if True, use the Extended Newick notation to write
+        shared internal nodes only once in each tree
+    :returns: encoded trees, or None if written to a file
+    """
+    if file is None:
+        return "".join(_write_all_fragments(trees, network))
+
+    _dump(_write_all_fragments(trees, network), file)
@@ -0,0 +1,118 @@
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Hashable, TypeVar
+from ..node import Node
+from .binary import dumps, _decode_all
+
+NodeData = TypeVar("NodeData", bound=Hashable)
+EdgeData = TypeVar("EdgeData", bound=Hashable)
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to an existing shared memory block without taking ownership."""
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:
+        # Before Python 3.13, attaching always registers the block for removal
+        # when the attaching process exits
+        memory = SharedMemory(name)
+        resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+
+class SharedTree:
+    """
+    Tree stored in a shared memory block, in the binary format.
+
+    Sending a large tree to worker processes through pipes requires pickling
+    and copying it once per worker. Instead, a tree can be exported once into
+    a shared memory block, whose name is sent to workers; each worker then
+    attaches to the block and rebuilds the tree from it, without copying the
+    encoded tree.
+
+    Shared trees are context managers. The process that creates the block is
+    its owner and removes it when closed; other processes only detach from it.
+    """
+
+    __slots__ = ["_memory", "_owner"]
+
+    def __init__(self, memory: SharedMemory, owner: bool):
+        """
+        Wrap a shared memory block containing an encoded tree.
+
+        :param memory: shared memory block
+        :param owner: whether to remove the block when closed
+        """
+        self._memory = memory
+        self._owner = owner
+
+    @classmethod
+    def create(
+        cls,
+        tree: Node[NodeData, EdgeData],
+        name: str | None = None,
+    ) -> "SharedTree":
+        """
+        Export a tree into a new shared memory block.
+
+        :param tree: tree to export
+        :param name: name of the block to create (default: random name)
+        :returns: shared tree owning the created block
+        """
+        data = dumps(tree)
+        memory = SharedMemory(name, create=True, size=len(data))
+        memory.buf[: len(data)] = data
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedTree":
+        """
+        Attach to a tree exported by another process.
+
+        :param name: name of the shared memory block containing the tree
+        :returns: shared tree referring to the block
+        """
+        return cls(_attach(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block, used to attach to it."""
+        return self._memory.name
+
+    @property
+    def buffer(self) -> memoryview:
+        """
+        Read-only view of the shared memory block, which contains the tree in
+        the format of :mod:`sowing.repr.binary`, possibly followed by padding.
+
+        The view must be released before closing the shared tree.
+        """
+        return self._memory.buf.toreadonly()
+
+    def load(self) -> Node[NodeData, EdgeData]:
+        """
+        Rebuild the shared tree.
+
+        :returns: decoded tree
+        """
+        with self._memory.buf.toreadonly() as view:
+            trees = _decode_all(view, exact=False)
+
+        if len(trees) != 1:
+            raise ValueError(f"expected a single encoded tree, got {len(trees)}")
+
+        return trees[0]
+
+    def close(self) -> None:
+        """Detach from the shared memory block, and remove it if owned."""
+        self._memory.close()
+
+        if self._owner:
+            self._owner = False
+            self._memory.unlink()
+
+    def __enter__(self) -> "SharedTree":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
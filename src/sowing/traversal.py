@@ -1,8 +1,7 @@
-from collections.abc import Callable, Generator, Hashable, Iterable
+from collections.abc import Callable, Generator, Hashable, Iterable, Iterator
 from typing import cast, Any, TypeVar, overload, Literal
-from functools import partial
 from inspect import signature
-from .node import Node
+from .node import Node, Edge
 from .zipper import Zipper
 
 T = TypeVar("T")
@@ -19,11 +18,6 @@ Traversal = Generator[
 ]
 
 
-def _default(value: T) -> Generator[T, U | None, U | T]:
-    result = yield value
-    return result if result is not None else value
-
-
 UnicityCheck = Literal[False, "id", "eq"]
 
 
@@ -61,16 +55,17 @@ def depth(
 
     seen_ids = set()
     seen_nodes = set()
+    skip_ids = seen_ids if unique == "id" else ()
+    skip_nodes = seen_nodes if unique == "eq" else ()
     cursor = node.unzip()
 
-    advance = partial(
-        Zipper.prev if reverse else Zipper.next,
-        preorder=preorder,
-    )
+    # Moving forward in preorder is equivalent to moving backward in
+    # postorder with flipped child order, and conversely
     root_start = not preorder == reverse
+    advance = Zipper._preorder if root_start else Zipper._postorder
 
     if not root_start:
-        cursor = advance(cursor)
+        cursor = advance(cursor, reverse)
 
     while True:
         node = cursor.node
@@ -80,12 +75,15 @@ def depth(
             or (unique == "id" and id(node) not in seen_ids)
             or (unique == "eq" and node not in seen_nodes)
         ):
-            cursor = yield from _default(cursor)
+            sent = yield cursor
+
+            if sent is not None:
+                cursor = sent
 
         if not root_start and cursor.is_root():
             return
 
-        cursor = advance(cursor, skip_ids=seen_ids, skip_nodes=seen_nodes)
+        cursor = advance(cursor, reverse, skip_ids, skip_nodes)
 
         if unique == "id":
             seen_ids.add(id(node))
@@ -132,21 +130,31 @@ def euler(
     cursor = node.unzip()
 
     while True:
-        cursor = yield from _default(cursor)
+        sent = yield cursor
+
+        if sent is not None:
+            cursor = sent
 
         if not cursor.is_leaf():
             cursor = cursor.down(child)
         else:
             while cursor.is_last_sibling(sibling) and not cursor.is_root():
                 cursor = cursor.up()
-                cursor = yield from _default(cursor)
+                sent = yield cursor
+
+                if sent is not None:
+                    cursor = sent
 
             if cursor.is_root():
                 return
             else:
                 pos = cursor.index
                 cursor = cursor.up()
-                cursor = yield from _default(cursor)
+                sent = yield cursor
+
+                if sent is not None:
+                    cursor = sent
+
                 cursor = cursor.down(pos + sibling)
 
 
@@ -164,17 +172,101 @@ def leaves(
     if node is None:
         return
 
-    advance = Zipper.prev if reverse else Zipper.next
-    cursor = advance(node.unzip())
+    # Backward postorder is the same as forward preorder with flipped order
+    advance = Zipper._preorder if reverse else Zipper._postorder
+    cursor = advance(node.unzip(), reverse)
 
     while True:
         if cursor.is_leaf():
-            cursor = yield from _default(cursor)
+            sent = yield cursor
+
+            if sent is not None:
+                cursor = sent
 
         if cursor.is_root():
             return
 
-        cursor = advance(cursor)
+        cursor = advance(cursor, reverse)
+
+
+def edges(
+    node: Node[NodeData, EdgeData] | None,
+    preorder: bool = False,
+    reverse: bool = False,
+    unique: UnicityCheck = False,
+) -> Iterator[tuple[Node[NodeData, EdgeData], int, Edge[NodeData, EdgeData] | None]]:
+    """
+    Traverse a tree in depth-first order without using zippers.
+
+    This visits nodes in the same order as :func:`depth`, but is much faster
+    because it does not keep track of the path to each node. Use it for
+    passes that only read the tree and do not need to edit it.
+
+    :param node: root node to start from
+    :param preorder: pass True to visit parents before children (preorder),
+        defaults to children before parents (postorder)
+    :param reverse: pass True to reverse the order
+    :param unique: how to behave with repeated subtrees (see :func:`depth`)
+    :returns: generator that yields a tuple for each node in the specified
+        order, made of the node, its depth, and the edge leading to it from
+        its parent (None for the root)
+    """
+    if node is None:
+        return
+
+    # Visiting nodes in reverse postorder is the same as visiting them in
+    # preorder with flipped child order, and conversely
+    parent_first = preorder != reverse
+    by_id = unique == "id"
+    seen = set()
+    stack = [(node, 0, None, False)]
+
+    while stack:
+        node, level, edge, expanded = stack.pop()
+
+        if expanded:
+            yield node, level, edge
+            continue
+
+        if unique is not False:
+            key = id(node) if by_id else node
+
+            if key in seen:
+                continue
+
+            seen.add(key)
+
+        children = node.edges
+
+        if parent_first:
+            yield node, level, edge
+        elif children:
+            stack.append((node, level, edge, True))
+        else:
+            yield node, level, edge
+            continue
+
+        stack.extend(
+            (child.node, level + 1, child, False)
+            for child in (children if reverse else reversed(children))
+        )
+
+
+def nodes(
+    node: Node[NodeData, EdgeData] | None,
+    preorder: bool = False,
+    reverse: bool = False,
+    unique: UnicityCheck = False,
+) -> Iterator[Node[NodeData, EdgeData]]:
+    """
+    Traverse the nodes of a tree in depth-first order without using zippers.
+
+    See :func:`edges` for a description of the parameters.
+
+    :returns: generator that yields nodes in the specified order
+    """
+    for item in edges(node, preorder=preorder, reverse=reverse, unique=unique):
+        yield item[0]
 
 
 def fold(
@@ -293,3 +385,104 @@ def map(
             raise TypeError("map: 'func' must accept between 1 and 4 arguments")
 
     return fold(wrapper, traversal)
+
+
+def reroot_fold(
+    root: Node[NodeData, EdgeData] | None,
+    up_func: Callable[[Node[NodeData, EdgeData], T | None, EdgeData | None], T],
+    combine_func: Callable[[T, T], T],
+) -> list[tuple[Node[NodeData, EdgeData], T]]:
+    """
+    Compute a bottom-up quantity for every possible rooting of a tree.
+
+    For a given rooting, the value of each subtree is computed by first
+    merging the values of its child subtrees, then passing the merged value
+    to the node. With the tree rerooted on each node in turn, as done by
+    :meth:`Zipper.root`, this function computes the value of the whole tree
+    for each choice of root in two passes, in linear total time, instead of
+    folding each rerooted tree separately.
+
+    For example, the number of edges on the longest path starting from each
+    node is obtained using ``up_func=lambda node, merged, edge: 0 if merged
+    is None else merged + 1`` and ``combine_func=max``.
+
+    :param root: tree to compute values for
+    :param up_func: callback receiving a node, the merged values of its child
+        subtrees (or None if it has no children in the current rooting), and
+        the data attached to the edge linking it to its parent in the current
+        rooting (None for the root), and returning the value of its subtree
+    :param combine_func: associative and commutative callback merging the
+        values of two sibling subtrees
+    :returns: list containing each node with the value of the tree rerooted
+        on it, listed in preorder
+    """
+    if root is None:
+        return []
+
+    def merge(left: T | None, right: T | None) -> T | None:
+        if left is None:
+            return right
+
+        if right is None:
+            return left
+
+        return combine_func(left, right)
+
+    # Number nodes in preorder, recording the parent of each one
+    order = []
+    parents = []
+    stack = [(root, -1, None)]
+
+    while stack:
+        node, parent, branch = stack.pop()
+        parents.append(parent)
+        order.append((node, branch))
+        position = len(order) - 1
+        stack.extend((edge.node, position, edge.data) for edge in reversed(node.edges))
+
+    children: list[list[int]] = [[] for _ in order]
+
+    for position in range(1, len(order)):
+        children[parents[position]].append(position)
+
+    # First pass: value of each subtree in the original rooting
+    below: list[Any] = [None] * len(order)
+
+    for position in reversed(range(len(order))):
+        node, branch = order[position]
+        merged = None
+
+        for child in children[position]:
+            merged = merge(merged, below[child])
+
+        below[position] = up_func(node, merged, branch)
+
+    # Second pass: value of the part of the tree containing the parent of
+    # each node, when rerooted on that node, then value for each rooting
+    above: list[Any] = [None] * len(order)
+    result = []
+
+    for position, (node, branch) in enumerate(order):
+        siblings = children[position]
+
+        # Merged values of the siblings to the left and to the right of
+        # each child, including the part above the current node on the left
+        prefix = [above[position]]
+
+        for child in siblings:
+            prefix.append(merge(prefix[-1], below[child]))
+
+        suffix = None
+
+        for index in reversed(range(len(siblings))):
+            child = siblings[index]
+            above[child] = up_func(
+                node,
+                merge(prefix[index], suffix),
+                order[child][1],
+            )
+            suffix = merge(below[child], suffix)
+
+        result.append((node, up_func(node, prefix[-1], None)))
+
+    return result
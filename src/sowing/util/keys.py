@@ -0,0 +1,29 @@
+from collections.abc import Hashable
+from immutables import Map
+
+
+def exact_key(value: Hashable) -> Hashable:
+    """
+    Get a key which is equal for two values only if they are equal and
+    have the same type, including the items of containers.
+
+    For example, 1 and 1.0 are equal values but get different keys, and so
+    do Map({"a": 1}) and Map({"a": 1.0}).
+
+    :param value: value to get a key for
+    :returns: hashable key
+    """
+    kind = type(value)
+
+    if kind is Map:
+        return kind, frozenset(
+            (exact_key(key), exact_key(item)) for key, item in value.items()
+        )
+
+    if kind is tuple:
+        return kind, tuple(exact_key(item) for item in value)
+
+    if kind is frozenset:
+        return kind, frozenset(exact_key(item) for item in value)
+
+    return kind, value
@@ -0,0 +1,101 @@
+from array import array
+from collections.abc import Callable, Iterable
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..node import Node, Edge
+
+# Flat encoding of a sequence of trees
+#
+# Trees are listed one after the other, each in postorder, as a sequence of
+# operations on a stack of edges. A non-negative operation creates a new node
+# whose children are the given number of last edges on the stack, and pushes
+# an edge leading to it. A negative operation -(i + 1) pushes an edge leading
+# to the i-th node created so far again, which lets shared subtrees be stored
+# only once. The data attached to each created node and to the edge pushed by
+# each operation is listed in the same order.
+#
+# After executing all operations, the stack contains an edge leading to the
+# root of each tree, attached to None.
+
+
+def flatten(trees: Iterable["Node"]) -> tuple[array, list, list]:
+    """
+    Encode a sequence of trees as a postorder sequence of operations.
+
+    Complexity: O(n), with n the number of distinct nodes in the trees.
+
+    :param trees: trees to encode
+    :returns: tuple made of the operations, the data attached to the created
+        nodes, and the data attached to the pushed edges
+    """
+    ops = array("i")
+    node_data = []
+    edge_data = []
+
+    # Index of each created node, keeping the nodes alive so that their
+    # identifiers are not reused
+    created: dict[int, tuple[int, Node]] = {}
+
+    for tree in trees:
+        stack = [(tree, None, False)]
+
+        while stack:
+            node, branch, expanded = stack.pop()
+
+            if expanded:
+                ops.append(len(node.edges))
+                node_data.append(node.data)
+                created[id(node)] = (len(created), node)
+            elif (known := created.get(id(node))) is not None:
+                ops.append(-known[0] - 1)
+            else:
+                stack.append((node, branch, True))
+                stack.extend(
+                    (edge.node, edge.data, False) for edge in reversed(node.edges)
+                )
+                continue
+
+            edge_data.append(branch)
+
+    return ops, node_data, edge_data
+
+
+def unflatten(
+    ops: Iterable[int],
+    node_data: Iterable[Any],
+    edge_data: Iterable[Any],
+    make_node: Callable[[Any, tuple["Edge", ...]], "Node"],
+    make_edge: Callable[["Node", Any], "Edge"],
+) -> list["Node"]:
+    """
+    Decode a sequence of trees from a postorder sequence of operations.
+
+    Complexity: O(n), with n the number of operations.
+
+    :param ops: operations, as returned by :func:`flatten`
+    :param node_data: data attached to each created node
+    :param edge_data: data attached to each pushed edge
+    :param make_node: function creating a node from its data and edges
+    :param make_edge: function creating an edge from its node and data
+    :returns: decoded trees
+    """
+    node_data = iter(node_data)
+    created = []
+    stack = []
+
+    for op, branch in zip(ops, edge_data):
+        if op > 0:
+            edges = tuple(stack[-op:])
+            del stack[-op:]
+            node = make_node(next(node_data), edges)
+            created.append(node)
+        elif op == 0:
+            node = make_node(next(node_data), ())
+            created.append(node)
+        else:
+            node = created[-op - 1]
+
+        stack.append(make_edge(node, branch))
+
+    return [edge.node for edge in stack]
@@ -43,6 +43,28 @@ class Zipper(Generic[NodeData, EdgeData]):
         if self.parent is None and self.index != -1:
             raise ValueError("root zipper child index must be -1")
 
+    @classmethod
+    def _make(
+        cls,
+        node: "Node[NodeData, EdgeData] | None",
+        data: EdgeData | None,
+        index: int,
+        depth: int,
+        parent: "Zipper[NodeData, EdgeData] | None",
+    ) -> Self:
+        """
+        Create a zipper without validating its fields.
+
+        For internal use only, when the fields are known to be consistent.
+        """
+        self = _new(cls)
+        _set_node(self, node)
+        _set_data(self, data)
+        _set_index(self, index)
+        _set_depth(self, depth)
+        _set_parent(self, parent)
+        return self
+
     def is_root(self) -> bool:
         """Test whether the pointed node is a root node."""
         return self.parent is None
@@ -82,13 +104,8 @@ class Zipper(Generic[NodeData, EdgeData]):
 
         edges = self.node.edges
         index %= len(edges)
-        return self.replace(
-            node=edges[index].node,
-            data=edges[index].data,
-            parent=self,
-            index=index,
-            depth=self.depth + 1,
-        )
+        edge = edges[index]
+        return self._make(edge.node, edge.data, index, self.depth + 1, self)
 
     def children(self) -> "Iterable[Zipper[NodeData, EdgeData]]":
         """Iterate through each child of the pointed node."""
@@ -108,18 +125,24 @@ class Zipper(Generic[NodeData, EdgeData]):
         if self.is_root():
             return self
 
-        parent = self.parent.root().node
-        parent = parent.replace(
-            edges=parent.edges[self.index + 1 :] + parent.edges[: self.index]
-        )
+        path = []
+        bubble = self
+
+        while not bubble.is_root():
+            path.append(bubble)
+            bubble = bubble.parent
+
+        # Reroot on each node along the path from the original root,
+        # attaching the previous rerooted tree below the next node
+        node = bubble.node
+
+        for bubble in reversed(path):
+            node = node.replace(
+                edges=node.edges[bubble.index + 1 :] + node.edges[: bubble.index]
+            )
+            node = bubble.node.add(node, data=bubble.data)
 
-        return self.replace(
-            node=self.node.add(parent, data=self.data),
-            data=None,
-            index=-1,
-            depth=0,
-            parent=None,
-        )
+        return self.replace(node=node, data=None, index=-1, depth=0, parent=None)
 
     def up(self) -> "Zipper[NodeData, EdgeData]":
         """Move to the parent of the pointed node."""
@@ -129,27 +152,27 @@ class Zipper(Generic[NodeData, EdgeData]):
         if self.parent.node is None:
             raise ValueError("cannot attach to empty parent zipper")
 
-        if self.node is None:
-            return self.parent.replace(node=self.parent.node.pop(self.index))
-
-        node = self.parent.node
-        edges = node.edges
-        edge = edges[self.index]
-
-        if edge.node is not self.node:
-            edge = edge.replace(node=self.node)
-
-        if edge.data is not self.data:
-            edge = edge.replace(data=self.data)
+        parent = self.parent
 
-        if edge is not edges[self.index]:
-            return self.parent.replace(
-                node=node.replace(
-                    edges=edges[: self.index] + (edge,) + edges[self.index + 1 :]
+        if self.node is None:
+            node = parent.node.pop(self.index)
+        else:
+            node = parent.node
+            edges = node.edges
+            edge = edges[self.index]
+
+            if edge.node is self.node and edge.data is self.data:
+                return parent
+
+            node = node.replace(
+                edges=(
+                    edges[: self.index]
+                    + (replace(edge, node=self.node, data=self.data),)
+                    + edges[self.index + 1 :]
                 )
             )
 
-        return self.parent
+        return self._make(node, parent.data, parent.index, parent.depth, parent.parent)
 
     def is_last_sibling(self, direction: int = 1) -> bool:
         """
@@ -197,21 +220,38 @@ class Zipper(Generic[NodeData, EdgeData]):
         up = self.up()
         return (up.down(index) for index in range(len(up.node.edges)) if index != skip)
 
+    def _descend(
+        self,
+        flip: bool,
+        skip_ids: "Collection[int]",
+        skip_nodes: "Collection[Node]",
+    ) -> "Zipper[NodeData, EdgeData] | None":
+        """Move to the first or last child, unless the subtree is skipped."""
+        node = self.node
+
+        if (
+            node is None
+            or not node.edges
+            or (skip_ids and id(node) in skip_ids)
+            or (skip_nodes and node in skip_nodes)
+        ):
+            return None
+
+        edges = node.edges
+        index = len(edges) - 1 if flip else 0
+        edge = edges[index]
+        return self._make(edge.node, edge.data, index, self.depth + 1, self)
+
     def _preorder(
         self,
         flip: bool,
         skip_ids: "Collection[int]" = (),
         skip_nodes: "Collection[Node]" = (),
     ) -> "Zipper[NodeData, EdgeData]":
-        child = -1 if flip else 0
         sibling = -1 if flip else 1
 
-        if (
-            id(self.node) not in skip_ids
-            and self.node not in skip_nodes
-            and not self.is_leaf()
-        ):
-            return self.down(child)
+        if (child := self._descend(flip, skip_ids, skip_nodes)) is not None:
+            return child
 
         while self.is_last_sibling(sibling):
             if self.is_root():
@@ -227,30 +267,16 @@ class Zipper(Generic[NodeData, EdgeData]):
         skip_ids: "Collection[int]" = (),
         skip_nodes: "Collection[Node]" = (),
     ) -> "Zipper[NodeData, EdgeData]":
-        child = -1 if flip else 0
         sibling = -1 if flip else 1
 
-        if self.is_root():
-            while (
-                id(self.node) not in skip_ids
-                and self.node not in skip_nodes
-                and not self.is_leaf()
-            ):
-                self = self.down(child)
+        if not self.is_root():
+            if self.is_last_sibling(sibling):
+                return self.up()
 
-            return self
+            self = self.sibling(sibling)
 
-        if self.is_last_sibling(sibling):
-            return self.up()
-
-        self = self.sibling(sibling)
-
-        while (
-            id(self.node) not in skip_ids
-            and self.node not in skip_nodes
-            and not self.is_leaf()
-        ):
-            self = self.down(child)
+        while (child := self._descend(flip, skip_ids, skip_nodes)) is not None:
+            self = child
 
         return self
 
@@ -292,6 +318,23 @@ class Zipper(Generic[NodeData, EdgeData]):
         else:
             return self._preorder(flip=True, skip_ids=skip_ids, skip_nodes=skip_nodes)
 
+    def path(self) -> tuple[int, ...]:
+        """
+        Get the position of the pointed node as the sequence of child indices
+        leading to it from the root.
+
+        The pointed node can be located again using :meth:`Node.at`.
+        """
+        indices = []
+        bubble = self
+
+        while bubble.parent is not None:
+            indices.append(bubble.index)
+            bubble = bubble.parent
+
+        indices.reverse()
+        return tuple(indices)
+
     def zip(self) -> "Node[NodeData, EdgeData] | None":
         """Zip up to the root and return it."""
         bubble = self
@@ -312,3 +355,13 @@ class Zipper(Generic[NodeData, EdgeData]):
             chars = signature(tree.__str__).parameters["chars"].default
 
         return self.zip().__str__(prefix=prefix, chars=chars, highlight=self.node)
+
+
+# Slot setters, used to initialize zippers without going through the
+# validation and immutability checks
+_new = object.__new__
+_set_node = Zipper.node.__set__
+_set_data = Zipper.data.__set__
+_set_index = Zipper.index.__set__
+_set_depth = Zipper.depth.__set__
+_set_parent = Zipper.parent.__set__
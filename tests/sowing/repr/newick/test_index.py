@@ -0,0 +1,94 @@
+from sowing.repr import newick
+from sowing.repr.newick.index import NewickIndex
+import pytest
+
+
+def _write_trees(path, count):
+    trees = [f"((a{i},b):{i},[comment;]'c;{i}');\n" for i in range(count)]
+    path.write_text("".join(trees))
+    return [newick.parse(tree) for tree in trees]
+
+
+def test_index(tmp_path):
+    path = tmp_path / "trees.nwk"
+    expected = _write_trees(path, 50)
+    index = NewickIndex.build(path)
+
+    assert len(index) == 50
+    assert index[0] == expected[0]
+    assert index[34] == expected[34]
+    assert index[-1] == expected[-1]
+    assert index[10:20] == expected[10:20]
+    assert index[::7] == expected[::7]
+    assert index[40:10] == []
+    assert list(index) == expected
+
+    with pytest.raises(IndexError):
+        index[50]
+
+
+def test_index_unterminated(tmp_path):
+    path = tmp_path / "trees.nwk"
+    path.write_text("(a,b);\n(c,d)\n")
+    index = NewickIndex.build(path)
+    assert len(index) == 2
+
+    with pytest.raises(newick.ParseError) as error:
+        index[1]
+
+    assert error.value.start == 13
+
+    path.write_text("(a,b);\n \n")
+    assert len(NewickIndex.build(path)) == 1
+
+    path.write_text("")
+    assert len(NewickIndex.build(path)) == 0
+
+
+def test_index_error(tmp_path):
+    path = tmp_path / "trees.nwk"
+    path.write_text("(a,b);\n(c,,d]);\n")
+    index = NewickIndex.build(path)
+    assert index[0] == newick.parse("(a,b);")
+
+    with pytest.raises(newick.ParseError) as error:
+        index[1]
+
+    assert error.value.start == 12
+
+
+def test_index_sidecar(tmp_path):
+    path = tmp_path / "trees.nwk"
+    sidecar = tmp_path / "trees.nwk.idx"
+    expected = _write_trees(path, 10)
+
+    index = NewickIndex.build(path, sidecar)
+    assert sidecar.exists()
+    assert index[3] == expected[3]
+
+    # Loaded from the sidecar without scanning the file
+    loaded = NewickIndex.build(path, sidecar)
+    assert loaded._bounds == index._bounds
+
+    # Rebuilt after the indexed file changes
+    expected = _write_trees(path, 12)
+    index = NewickIndex.build(path, sidecar)
+    assert len(index) == 12
+    assert index[11] == expected[11]
+
+
+def test_index_lexer(tmp_path):
+    # Lexers which only accept strings are given decoded trees
+    path = tmp_path / "trees.nwk"
+    expected = _write_trees(path, 20)
+    index = NewickIndex.build(path, lexer=newick.tokenize)
+    assert index[3] == expected[3]
+    assert index[5:15] == expected[5:15]
+
+    path.write_text("(é,ü);\n(c,,d]);\n")
+    index = NewickIndex.build(path, lexer=newick.tokenize)
+
+    with pytest.raises(newick.ParseError) as error:
+        index[1]
+
+    assert error.value.start == 14
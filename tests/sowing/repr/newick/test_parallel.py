@@ -0,0 +1,74 @@
+from sowing.node import Node
+from sowing.repr import newick
+from sowing.repr.newick.parallel import _pack, _unpack
+import pytest
+
+
+def _make_trees(count):
+    return "\n".join(
+        f"((a{i}:1,'b;{i}'[&x={i}]):{i},(c[;],d)e[&&NHX:S={i}])root{i};"
+        for i in range(count)
+    )
+
+
+def test_pack_unpack():
+    trees = newick.parse_all(_make_trees(10)) + [Node(), Node(1).add(Node(2), data=3)]
+    arities, node_data, edge_data = _pack(trees)
+    assert len(arities) == len(node_data) == len(edge_data) == 10 * 7 + 3
+    assert _unpack((arities, node_data, edge_data)) == trees
+    assert _pack([]) == _pack(())
+    assert _unpack(_pack([])) == []
+
+
+def test_parse_all_parallel(tmp_path):
+    path = tmp_path / "trees.nwk"
+    data = _make_trees(500)
+    path.write_text(data)
+    expected = newick.parse_all(data)
+
+    assert list(newick.parse_all_parallel(path, workers=2, batch_size=1000)) == (
+        expected
+    )
+    assert list(newick.parse_all_parallel(str(path), workers=1)) == expected
+
+    path.write_text("")
+    assert list(newick.parse_all_parallel(path, workers=2)) == []
+
+
+def test_parse_all_parallel_error(tmp_path):
+    path = tmp_path / "trees.nwk"
+    path.write_text(_make_trees(50) + "\n(a,b));\n" + _make_trees(50))
+
+    with pytest.raises(newick.ParseError) as err:
+        list(newick.parse_all_parallel(path, workers=2, batch_size=100))
+
+    start = len(_make_trees(50)) + 6
+    assert "expected ';' after end of tree, not ')'" in str(err.value)
+    assert err.value.start == start
+    assert err.value.end == start + 1
+
+
+def test_parse_all_parallel_lexer(tmp_path):
+    # Lexers which only accept strings are given decoded batches
+    path = tmp_path / "trees.nwk"
+    data = _make_trees(50) + "\n(é,ü);\n(c,d));"
+    path.write_text(data)
+
+    with pytest.raises(newick.ParseError) as err:
+        list(
+            newick.parse_all_parallel(
+                path, workers=2, batch_size=100, lexer=newick.tokenize
+            )
+        )
+
+    start = len(data.encode()) - 2
+    assert "expected ';' after end of tree, not ')'" in str(err.value)
+    assert err.value.start == start
+    assert err.value.end == start + 1
+
+    path.write_text(data[:-2] + ";")
+    assert list(
+        newick.parse_all_parallel(
+            path, workers=2, batch_size=100, lexer=newick.tokenize
+        )
+    ) == newick.parse_all(data[:-2] + ";")
@@ -1,7 +1,9 @@
 from sowing.node import Node, Edge
 from sowing.repr import newick
 from immutables import Map
+from dataclasses import dataclass
 import pytest
+import time
 
 
 def test_topology():
@@ -309,3 +311,277 @@ def test_phylip():
             .add(Node(Map({"name": "dog"})), data=Map({"length": "25.46154"}))
         )
     )
+
+
+def test_parse_all():
+    assert newick.parse_all("") == []
+    assert newick.parse_all("a;(b,c);\n;") == [
+        Node(Map({"name": "a"})),
+        Node().add(Node(Map({"name": "b"}))).add(Node(Map({"name": "c"}))),
+        Node(),
+    ]
+
+    with pytest.raises(newick.ParseError) as err:
+        newick.parse_all("a;(b,c));")
+
+    assert "expected ';' after end of tree, not ')'" in str(err.value)
+    assert err.value.start == 7
+    assert err.value.end == 8
+
+
+lexer_samples = (
+    "",
+    " \t\n",
+    ";",
+    "(,);",
+    "((),(,,),);",
+    "(left,right)root;",
+    "(_a_b_,'c d':1.5:2:3);",
+    "('quote''quote','end''','''');",
+    "(a[c1],b[c2[nested]])[c3]x;",
+    "(a[&&NHX:S=human:E=1.1.1.1]:1,b[&&NHX:S=it's])c;",
+    "a[&&NHX:'quote'':=arg'='quote=:''value'];",
+    "a[&height=100.0,colour={red},];",
+    "a[&height=[],colour=(),test=[x]];",
+    "(a:12[&s=,e=],b:[&&NHX:S=:E=]);",
+    "(a,b);(c,d);",
+    "()'unclosed;",
+    "()[[];",
+    "()][];",
+    "(node[&&NHX:=value]",
+    "(node[&test,=]",
+)
+
+
+def _lex_all(lexer, data):
+    result = []
+
+    try:
+        for token in lexer(data):
+            result.append(token)
+    except newick.ParseError as err:
+        result.append((str(err), err.start, err.end))
+
+    return result
+
+
+def test_lexers():
+    for data in lexer_samples:
+        assert _lex_all(newick.tokenize_regex, data) == _lex_all(newick.tokenize, data)
+
+    for data in lexer_samples[:-6]:
+        for lexer in (newick.tokenize, newick.tokenize_regex):
+            assert newick.parse_all(data, lexer=lexer) == newick.parse_all(data)
+
+    assert newick.parse("_a_b;") == Node(Map({"name": " a b"}))
+    assert newick.parse("'a''';") == Node(Map({"name": "a'"}))
+
+
+@pytest.mark.benchmark
+def test_lexers_faster():
+    size = 20_000
+    data = "(" + ",".join(f"leaf_{i}:{i}[&x=y]" for i in range(size)) + ");"
+
+    def measure(lexer):
+        durations = []
+
+        for _ in range(3):
+            start = time.perf_counter()
+            tokens = list(lexer(data))
+            durations.append(time.perf_counter() - start)
+
+        return tokens, min(durations)
+
+    simple_tokens, simple_dur = measure(newick.tokenize)
+    regex_tokens, regex_dur = measure(newick.tokenize_regex)
+
+    assert simple_tokens == regex_tokens
+    assert len(newick.parse(data).edges) == size
+
+    print("Simple lexer time:", simple_dur)
+    print("Regex lexer time:", regex_dur)
+    assert regex_dur < simple_dur
+
+
+def test_binary():
+    data = "(a_b:1,'quote''d'[&&NHX:S=é])root[&k=ü];"
+    expected = newick.parse(data)
+    assert expected.edges[1].node.data["S"] == "é"
+
+    for wrap in (bytes, bytearray, memoryview):
+        assert newick.parse(wrap(data.encode())) == expected
+        assert newick.parse_all(wrap(data.encode() * 2)) == [expected, expected]
+
+    with pytest.raises(newick.ParseError) as err:
+        newick.parse("(é,'ü);".encode())
+
+    assert "unclosed string" in str(err.value)
+    assert err.value.start == 4
+    assert err.value.end == 9
+
+    with pytest.raises(newick.ParseError) as err:
+        newick.parse(b"(a,\xff\xfe);")
+
+    assert "invalid UTF-8 data" in str(err.value)
+    assert err.value.start == 3
+    assert err.value.end == 5
+
+
+def test_share():
+    data = (
+        "((a:1,b:1)x:2,(a:1,b:1)x:2,c[&&NHX:k=v]);" "(((a:1,b:1)x:2,c[&&NHX:k=v]),d);"
+    )
+    plain = newick.parse_all(data)
+    shared = newick.parse_all(data, share=True)
+    assert shared == plain
+
+    # Repeated subtrees inside a single tree
+    first, second = shared
+    assert first.edges[0] is first.edges[1]
+    # Repeated subtrees across trees
+    assert second.edges[0].node.edges[0] is first.edges[0]
+    assert second.edges[0].node.edges[1] is first.edges[2]
+
+    # Sharing with an explicit table
+    table = newick.SharingTable()
+    one = newick.parse("(a,b);", share=table)
+    two = newick.parse("((a,b),c);", share=table)
+    assert two.edges[0].node is one
+    assert newick.parse("(a,b);", share=True) is not one
+
+
+def test_share_memory():
+    import tracemalloc
+
+    data = "".join(
+        f"(({i % 4}:1,(a:1,b:2)[&&NHX:k=v]:3),(c,(d,(e,f))));" for i in range(500)
+    )
+
+    def measure(share):
+        tracemalloc.start()
+        trees = newick.parse_all(data, share=share)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del trees
+        return size
+
+    assert measure(True) * 4 < measure(False)
+
+
+@dataclass(frozen=True, slots=True)
+class Clade:
+    name: str = ""
+    rank: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class Branch:
+    length: float = 0.0
+    support: float | None = None
+
+
+def test_schema():
+    schema = newick.Schema(
+        clade=Clade,
+        branch=Branch,
+        converters=Map({"length": float, "support": float, "rank": int}),
+    )
+    tree = newick.parse("(a[&rank=2]:1.5,b::90,c)r:3;", schema=schema)
+    assert tree == (
+        Node(Clade("r"))
+        .add(Node(Clade("a", rank=2)), data=Branch(1.5))
+        .add(Node(Clade("b")), data=Branch(support=90.0))
+        .add(Node(Clade("c")), data=Branch())
+    )
+
+    # Converters also apply to property maps
+    tree = newick.parse(
+        "(a:1,b:2);",
+        schema=newick.Schema(converters=Map({"length": float})),
+    )
+    assert tree == (
+        Node(Map())
+        .add(Node(Map({"name": "a"})), data=Map({"length": 1.0}))
+        .add(Node(Map({"name": "b"})), data=Map({"length": 2.0}))
+    )
+
+    # Sharing records between trees
+    first, second = newick.parse_all("(a:1,b);((a:1,b),c);", share=True, schema=schema)
+    assert second.edges[0].node is first
+
+
+def test_schema_error():
+    schema = newick.Schema(
+        clade=Clade,
+        branch=Branch,
+        converters=Map({"length": float}),
+    )
+
+    with pytest.raises(newick.ParseError) as error:
+        newick.parse("(a:1,b:x);", schema=schema)
+
+    assert error.value.start == 5
+    assert error.value.end == 8
+
+    with pytest.raises(newick.ParseError) as error:
+        newick.parse("(a[&other=1],b);", schema=schema)
+
+    assert error.value.start == 1
+    assert error.value.end == 12
+    assert "other" in error.value.message
+
+
+def test_network():
+    shared = newick.parse("(a,b)x;")
+    tree = newick.parse("((c,(a,b)x#H1),#H1:2);", network=True)
+    assert tree == (
+        Node()
+        .add(Node().add(Node(Map({"name": "c"}))).add(shared))
+        .add(shared, data=Map({"length": "2"}))
+    )
+    assert tree.edges[0].node.edges[1].node is tree.edges[1].node
+
+    # Forward references
+    tree = newick.parse("(#H1,(c,(a,b)x#H1));", network=True)
+    assert tree.edges[0].node is tree.edges[1].node.edges[1].node
+    assert tree.edges[0].node == shared
+
+    # Nested forward references
+    tree = newick.parse("(#H2,(#H1,(c,d)#H2)y,(a,b)#H1);", network=True)
+    assert tree.edges[0].node is tree.edges[1].node.edges[1].node
+    assert tree.edges[1].node.edges[0].node is tree.edges[2].node
+
+    # Shared leaves
+    tree = newick.parse("(a#H1,(b,a#H1));", network=True)
+    assert tree.edges[0].node is tree.edges[1].node.edges[1].node
+    assert tree.edges[0].node == Node(Map({"name": "a"}))
+
+    # Sharing equal subtrees keeps distinct tags apart
+    data = "((#H1,#H2),(x,y)#H1,(z,w)#H2);"
+    tree = newick.parse(data, network=True, share=True)
+    assert tree == newick.parse(data, network=True)
+    assert tree.edges[0].node.edges[0].node is tree.edges[1].node
+    assert tree.edges[0].node.edges[1].node is tree.edges[2].node
+    assert newick.write(tree, network=True) == "(((x,y)#H1,(z,w)#H2),#H1,#H2);"
+
+    # Tags are plain labels by default
+    assert newick.parse("(a#H1);").edges[0].node == Node(Map({"name": "a#H1"}))
+
+
+def test_network_error():
+    with pytest.raises(newick.ParseError) as error:
+        newick.parse("((a,b)#H1,(c,d)#H1);", network=True)
+
+    assert error.value.start == 15
+    assert error.value.end == 18
+
+    with pytest.raises(newick.ParseError) as error:
+        newick.parse("((#H1,b)#H1,c);", network=True)
+
+    assert error.value.start == 2
+    assert error.value.end == 5
+
+    with pytest.raises(newick.ParseError) as error:
+        newick.parse("((#H2,b)#H1,(#H1,c)#H2);", network=True)
+
+    assert "contains itself" in error.value.message
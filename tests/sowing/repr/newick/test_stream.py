@@ -0,0 +1,147 @@
+from sowing.node import Node
+from sowing.repr import newick
+from immutables import Map
+from io import BytesIO, StringIO
+import mmap
+import pytest
+
+multiple = """
+    (a,b)'semi;colon';
+    (c[comment;with'quote],d)[outer[nested;]];
+    (e[&&NHX:S=it's:E=';'],f[&key=';',other=x;y]):1;
+    'quote''d;';
+    ;
+"""
+
+
+def test_iter_parse_chunks():
+    expected = newick.parse_all(multiple)
+    assert len(expected) == 5
+
+    for chunk_size in (1, 2, 3, 5, 8, 1 << 16):
+        assert list(newick.iter_parse(StringIO(multiple), chunk_size)) == expected
+
+
+def test_iter_parse_values():
+    trees = newick.iter_parse(StringIO("(a,b)c; [nothing] d[&&NHX:S=x];"))
+    assert next(trees) == (
+        Node(Map({"name": "c"}))
+        .add(Node(Map({"name": "a"})))
+        .add(Node(Map({"name": "b"})))
+    )
+    assert next(trees) == Node(Map({"name": "d", "S": "x"}))
+
+    with pytest.raises(StopIteration):
+        next(trees)
+
+    assert list(newick.iter_parse(StringIO(""))) == []
+    assert list(newick.iter_parse(StringIO(" \n\t"))) == []
+
+
+def test_iter_parse_path(tmp_path):
+    path = tmp_path / "trees.nwk"
+    path.write_text(multiple)
+    assert list(newick.iter_parse(path, chunk_size=4)) == newick.parse_all(multiple)
+    assert list(newick.iter_parse(str(path))) == newick.parse_all(multiple)
+
+
+def test_iter_parse_error():
+    for chunk_size in (1, 3, 1 << 16):
+        trees = newick.iter_parse(StringIO("(a,b);\n(c,d));"), chunk_size)
+        assert next(trees) is not None
+
+        with pytest.raises(newick.ParseError) as err:
+            next(trees)
+
+        assert "expected ';' after end of tree, not ')'" in str(err.value)
+        assert err.value.start == 12
+        assert err.value.end == 13
+
+        trees = newick.iter_parse(StringIO("(a,b);\n(c,'d);"), chunk_size)
+        assert next(trees) is not None
+
+        with pytest.raises(newick.ParseError) as err:
+            next(trees)
+
+        assert "unclosed string" in str(err.value)
+        assert err.value.start == 10
+        assert err.value.end == 14
+
+        trees = newick.iter_parse(StringIO("(a,b);\n(c,d)"), chunk_size)
+        assert next(trees) is not None
+
+        with pytest.raises(newick.ParseError) as err:
+            next(trees)
+
+        assert "expected ';' after end of tree, not 'end'" in str(err.value)
+        assert err.value.start == 12
+        assert err.value.end == 12
+
+
+def test_iter_parse_binary(tmp_path):
+    expected = newick.parse_all(multiple)
+    data = multiple.encode()
+
+    for chunk_size in (1, 2, 3, 5, 8, 1 << 16):
+        assert list(newick.iter_parse(BytesIO(data), chunk_size)) == expected
+
+    assert list(newick.iter_parse(data)) == expected
+    assert list(newick.iter_parse(memoryview(data))) == expected
+
+    path = tmp_path / "trees.nwk"
+    path.write_bytes(data)
+
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            assert list(newick.iter_parse(buffer)) == expected
+
+
+def test_iter_parse_binary_error():
+    # Positions are given in bytes, not characters
+    data = "(é,ü);\n(c,d));".encode()
+
+    for source in (data, BytesIO(data)):
+        trees = newick.iter_parse(source, chunk_size=3)
+        assert next(trees) == (
+            Node().add(Node(Map({"name": "é"}))).add(Node(Map({"name": "ü"})))
+        )
+
+        with pytest.raises(newick.ParseError) as err:
+            next(trees)
+
+        assert "expected ';' after end of tree, not ')'" in str(err.value)
+        assert err.value.start == 14
+        assert err.value.end == 15
+
+
+def test_iter_parse_lexer(tmp_path):
+    # Binary inputs are decoded for lexers which only accept strings
+    expected = newick.parse_all(multiple)
+    data = multiple.encode()
+    path = tmp_path / "trees.nwk"
+    path.write_bytes(data)
+
+    for source in (path, data, BytesIO(data)):
+        assert list(newick.iter_parse(source, 3, newick.tokenize)) == expected
+
+    data = "(é,ü);\n(c,d));".encode()
+
+    with pytest.raises(newick.ParseError) as err:
+        list(newick.iter_parse(BytesIO(data), 3, newick.tokenize))
+
+    assert err.value.start == 14
+    assert err.value.end == 15
+
+    with pytest.raises(newick.ParseError) as err:
+        list(newick.iter_parse(b"(a,\xff);", lexer=newick.tokenize))
+
+    assert "invalid UTF-8 data" in str(err.value)
+    assert err.value.start == 3
+    assert err.value.end == 4
+
+
+def test_iter_parse_share():
+    data = "((a,b),c);((a,b),d);"
+    first, second = newick.iter_parse(StringIO(data), chunk_size=3, share=True)
+    assert first == newick.parse("((a,b),c);")
+    assert first.edges[0] is second.edges[0]
@@ -1,6 +1,7 @@
 from sowing.node import Node
 from sowing.repr import newick
 from immutables import Map
+from io import BytesIO, StringIO
 
 
 def test_topology():
@@ -240,3 +241,66 @@ def test_phylip():
         ":7.52973,((monkey:100.8593,cat:47.14069):20.59201,weasel:18.87953)"
         ":2.0946):3.87382,dog:25.46154);"
     )
+
+
+def test_write_file():
+    tree = newick.parse("((a:1,'b c':2)x[&k=v],d);")
+    expected = "((a:1,b_c:2)x[&k=v],d);"
+    assert newick.write(tree) == expected
+
+    text = StringIO()
+    assert newick.write(tree, text) is None
+    assert text.getvalue() == expected
+
+    binary = BytesIO()
+    newick.write(tree, binary)
+    assert binary.getvalue() == expected.encode()
+
+
+def test_write_all():
+    trees = [newick.parse("(a,b);"), newick.parse("((c,d),e);"), Node()]
+    expected = "(a,b);\n((c,d),e);\n;\n"
+    assert newick.write_all(trees) == expected
+
+    text = StringIO()
+    newick.write_all(iter(trees), text)
+    assert text.getvalue() == expected
+    assert newick.parse_all(text.getvalue()) == trees
+
+
+def test_write_deep():
+    size = 50_000
+    tree = Node(Map({"name": "leaf"}))
+
+    for _ in range(size):
+        tree = Node().add(tree).add(Node(Map({"name": "x"})))
+
+    expected = "(" * size + "leaf" + ",x)" * size + ";"
+    assert newick.write(tree) == expected
+
+    binary = BytesIO()
+    newick.write(tree, binary)
+    assert binary.getvalue() == expected.encode()
+
+
+def test_write_network():
+    shared = newick.parse("(a,b)x;")
+    tree = (
+        Node()
+        .add(Node().add(Node(Map({"name": "c"}))).add(shared))
+        .add(shared, data=Map({"length": 2}))
+        .add(Node(Map({"name": "d"})))
+        .add(Node(Map({"name": "d"})))
+    )
+    assert newick.write(tree) == "((c,(a,b)x),(a,b)x:2,d,d);"
+    assert newick.write(tree, network=True) == "((c,(a,b)x#H1),#H1:2,d,d);"
+
+    # Exponential blowup of shared subtrees
+    tree = Node(Map({"name": "a"}))
+
+    for _ in range(40):
+        tree = Node().add(tree).add(tree)
+
+    data = newick.write(tree, network=True)
+    assert len(data) < 1000
+    assert newick.parse(data, network=True) == tree
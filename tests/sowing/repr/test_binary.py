@@ -0,0 +1,108 @@
+from sowing.node import Node
+from sowing.repr import binary, newick
+from immutables import Map
+from io import BytesIO
+import pytest
+import time
+
+
+def test_roundtrip():
+    trees = [
+        Node(),
+        Node(8),
+        Node("a").add(Node("b"), data=1).add(Node("c"), data=2.5),
+        newick.parse("((a:1,b:2)x[&k=v],(c,d)y:3)r;"),
+        Node(1).add(Node(True)).add(Node(1.0)),
+    ]
+
+    for tree in trees:
+        decoded = binary.loads(binary.dumps(tree))
+        assert decoded == tree
+
+    # Equal values of different types are kept apart
+    decoded = binary.loads(binary.dumps(trees[-1]))
+    assert [type(edge.node.data) for edge in decoded.edges] == [bool, float]
+
+    # Including inside containers
+    tree = Node(Map({"a": 1})).add(Node(Map({"a": 1.0}))).add(Node((1, True)))
+    decoded = binary.loads(binary.dumps(tree))
+    assert type(decoded.data["a"]) is int
+    assert type(decoded.edges[0].node.data["a"]) is float
+    assert [type(item) for item in decoded.edges[1].node.data] == [int, bool]
+
+    assert binary.loads_all(binary.dumps_all(trees)) == trees
+    assert binary.loads_all(binary.dumps_all([])) == []
+
+
+def test_file():
+    tree = newick.parse("((a,b),c);")
+    file = BytesIO()
+    binary.dump(tree, file)
+    file.seek(0)
+    assert binary.load(file) == tree
+
+    file = BytesIO()
+    binary.dump_all([tree, tree], file)
+    file.seek(0)
+    assert binary.load_all(file) == [tree, tree]
+
+
+def test_shared():
+    tree = Node("leaf")
+
+    for _ in range(100):
+        tree = Node().add(tree, data="left").add(tree, data="right")
+
+    data = binary.dumps(tree)
+    assert len(data) < 4096
+
+    decoded = binary.loads(data)
+    assert decoded == tree
+    assert decoded.edges[0].node is decoded.edges[1].node
+
+    # Subtrees shared between trees
+    first = newick.parse("((a,b),c);")
+    second = Node().add(first.edges[0].node).add(Node("d"))
+    one, two = binary.loads_all(binary.dumps_all([first, second]))
+    assert one.edges[0].node is two.edges[0].node
+
+
+def test_invalid():
+    data = binary.dumps(Node("a"))
+
+    with pytest.raises(ValueError, match="not an encoded tree"):
+        binary.loads(b"XXXX" + data[4:])
+
+    with pytest.raises(ValueError, match="truncated"):
+        binary.loads(data[:-1])
+
+    with pytest.raises(ValueError, match="truncated"):
+        binary.loads(data[:10])
+
+    with pytest.raises(ValueError, match="single"):
+        binary.loads(binary.dumps_all([Node(), Node()]))
+
+
+@pytest.mark.benchmark
+def test_faster():
+    text = "(" + ",".join(f"(l{i}:{i},m{i}:1)[&x=y]" for i in range(5000)) + ");"
+    tree = newick.parse(text)
+    data = binary.dumps(tree)
+
+    def measure(function, value):
+        durations = []
+
+        for _ in range(3):
+            start = time.perf_counter()
+            result = function(value)
+            durations.append(time.perf_counter() - start)
+
+        return result, min(durations)
+
+    newick_tree, newick_dur = measure(newick.parse, text)
+    binary_tree, binary_dur = measure(binary.loads, data)
+    assert newick_tree == binary_tree == tree
+
+    print("Newick load time:", newick_dur)
+    print("Binary load time:", binary_dur)
+    assert binary_dur * 2 < newick_dur
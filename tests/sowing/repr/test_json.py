@@ -1,6 +1,7 @@
 from sowing.node import Node
-from sowing.repr.json import TreeEncoder, tree_decoder
-from json import dumps, loads
+from sowing.repr.json import TreeEncoder, tree_decoder, load
+from json import dump, dumps, loads, JSONDecodeError
+from io import StringIO
 import pytest
 
 
@@ -135,3 +136,143 @@ def test_complex_decode():
         node_decoder=_test_decoder,
         edge_decoder=_test_decoder,
     ) == Node(_Test()).add(Node(_Test()), data=_Test())
+
+
+def test_refs():
+    shared = Node("b").add(Node("c"))
+    tree = Node("a").add(shared, data=1).add(shared, data=2)
+
+    assert dumps(tree, cls=TreeEncoder, refs=True) == dumps(
+        {
+            "id": 0,
+            "edges": [
+                {
+                    "node": {
+                        "id": 1,
+                        "edges": [
+                            {"node": {"id": 2, "edges": [], "data": "c"}, "data": None}
+                        ],
+                        "data": "b",
+                    },
+                    "data": 1,
+                },
+                {"node": {"ref": 1}, "data": 2},
+            ],
+            "data": "a",
+        }
+    )
+
+    decoded = tree_decoder(loads(dumps(tree, cls=TreeEncoder, refs=True)), refs=True)
+    assert decoded == tree
+    assert decoded.edges[0].node is decoded.edges[1].node
+
+    # Exponential blowup of shared subtrees
+    tree = Node("leaf")
+
+    for _ in range(50):
+        tree = Node().add(tree).add(tree)
+
+    data = dumps(tree, cls=TreeEncoder, refs=True)
+    assert len(data) < 5000
+    assert tree_decoder(loads(data), refs=True) == tree
+
+    # Encoders can be reused
+    encoder = TreeEncoder(refs=True)
+    assert encoder.encode(shared) == encoder.encode(shared)
+
+    with pytest.raises(ValueError) as err:
+        tree_decoder(loads('{"edges": [{"node": {"ref": 4}}]}'), refs=True)
+
+    assert "reference to unknown node 4" in str(err.value)
+
+
+def _caterpillar(size):
+    tree = Node("leaf")
+
+    for index in range(size):
+        tree = Node(index).add(tree, data=("x", index)).add(Node("other"))
+
+    return tree
+
+
+def test_deep():
+    tree = _caterpillar(20_000)
+    data = dumps(tree, cls=TreeEncoder)
+    assert data.startswith('{"edges": [{"node": {"edges": [{"node": ')
+
+    file = StringIO()
+    dump(tree, file, cls=TreeEncoder)
+    assert file.getvalue() == data
+
+    decoded = load(StringIO(data), edge_decoder=lambda x: x and x[1])
+    assert decoded.edges[0].data == 19_999
+    assert decoded.edges[0].node.edges[0].data == 19_998
+
+    value = {"edges": [], "data": "leaf"}
+
+    for _ in range(20_000):
+        value = {"edges": [{"node": value}], "data": None}
+
+    decoded = tree_decoder(value)
+    assert decoded.edges[0].node.edges[0].node.data is None
+
+
+def test_load():
+    for chunk_size in (1, 3, 1 << 16):
+        assert load(StringIO('{"data": null, "edges": []}'), chunk_size=chunk_size) == (
+            Node()
+        )
+        assert load(
+            StringIO(
+                ' { "data" : "a" , "edges" : [\n'
+                '{"data": 1234, "node": {"data": "b", "edges": []}},'
+                '{"node": {"edges": [], "data": {"edges": [1, 2]}}}'
+                "] } \n"
+            ),
+            node_decoder=lambda x: tuple(x["edges"]) if isinstance(x, dict) else x,
+            chunk_size=chunk_size,
+        ) == Node("a").add(Node("b"), data=1234).add(Node((1, 2)))
+
+        shared = Node("b").add(Node("c"))
+        tree = Node("a").add(shared, data=1).add(shared, data=2)
+        data = dumps(tree, cls=TreeEncoder, refs=True)
+        decoded = load(StringIO(data), refs=True, chunk_size=chunk_size)
+        assert decoded == tree
+        assert decoded.edges[0].node is decoded.edges[1].node
+
+    assert load(
+        StringIO('{"data": "test!", "edges": []}'),
+        node_decoder=_test_decoder,
+    ) == Node(_Test())
+
+    with pytest.raises(TypeError) as err:
+        load(StringIO('{"invalid": "object"}'))
+
+    assert "got keys ['invalid']" in str(err.value)
+
+    with pytest.raises(TypeError) as err:
+        load(StringIO('{"edges": 12}'))
+
+    assert "node edges must be a list" in str(err.value)
+
+    with pytest.raises(JSONDecodeError):
+        load(StringIO('{"edges": [], "data": nul}'))
+
+    with pytest.raises(JSONDecodeError):
+        load(StringIO('{"edges": []'))
+
+    with pytest.raises(JSONDecodeError):
+        load(StringIO('{"edges": []} {}'))
+
+    # Errors are located relative to the whole file
+    data = '{\n  "edges": [\n    {"data": 1, "edges": []},\n    {"data": nul}\n  ]\n}'
+    pos = data.index("nul")
+
+    for chunk_size in (1, 3, 7, 1 << 16):
+        with pytest.raises(JSONDecodeError) as err:
+            load(StringIO(data), chunk_size=chunk_size)
+
+        assert err.value.pos == pos
+        assert err.value.lineno == 4
+        assert err.value.colno == 14
+        assert f"line 4 column 14 (char {pos})" in str(err.value)
@@ -0,0 +1,59 @@
+from sowing.node import Node
+from sowing.repr import newick
+from sowing.repr.shared import SharedTree
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import pytest
+
+
+def _count_leaves(name):
+    with SharedTree.attach(name) as shared:
+        tree = shared.load()
+
+    stack = [tree]
+    count = 0
+
+    while stack:
+        node = stack.pop()
+        count += not node.edges
+        stack.extend(edge.node for edge in node.edges)
+
+    return count, hash(tree)
+
+
+def test_shared():
+    tree = newick.parse("((a:1,b:2)x[&k=v],(c,d)y:3)r;")
+
+    with SharedTree.create(tree) as shared:
+        assert shared.load() == tree
+
+        with SharedTree.attach(shared.name) as attached:
+            assert attached.load() == tree
+
+            with attached.buffer as view:
+                assert view.readonly
+                assert bytes(view[:4]) == b"SOWB"
+
+        # Detaching from the block does not remove it
+        assert shared.load() == tree
+
+        name = shared.name
+
+    # Closing the owner removes the block
+    with pytest.raises(FileNotFoundError):
+        SharedTree.attach(name)
+
+
+def test_shared_workers():
+    tree = Node(0)
+
+    for index in range(500):
+        tree = Node(index).add(tree).add(Node(-index))
+
+    context = multiprocessing.get_context("spawn")
+
+    with SharedTree.create(tree) as shared:
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+            results = list(executor.map(_count_leaves, [shared.name] * 4))
+
+    assert results == [(501, hash(tree))] * 4
@@ -0,0 +1,149 @@
+from sowing.node import Node, Edge
+from sowing.frozen import FrozenTree, FrozenNode, NONE
+from sowing import traversal
+from sowing.repr import newick
+from immutables import Map
+import sys
+import tracemalloc
+import pytest
+
+
+def test_convert():
+    tree = newick.parse("((a:1,b:2)x[&k=v],(c,(d,e)z)y:3,f)r;")
+    frozen = FrozenTree.from_node(tree)
+
+    # Nodes are numbered in preorder
+    assert len(frozen) == 10
+    assert [frozen.data(index)["name"] for index in range(len(frozen))] == list(
+        "rxabyczdef"
+    )
+    assert frozen.branch(4) == tree.edges[1].data
+    assert list(frozen.parent) == [NONE, 0, 1, 1, 0, 4, 4, 6, 6, 0]
+    assert list(frozen.first_child) == [1, 2, NONE, NONE, 5, NONE, 7, NONE, NONE, NONE]
+    assert list(frozen.next_sibling) == [NONE, 4, 3, NONE, 9, 6, NONE, 8, NONE, NONE]
+
+    assert frozen.to_node() == tree
+    assert frozen.to_node(1) == tree.edges[0].node
+    assert frozen.to_node(6) == tree.edges[1].node.edges[1].node
+    assert frozen.to_node(9) == tree.edges[2].node
+
+    assert FrozenTree.from_node(Node()).to_node() == Node()
+
+    # Equal values of different types are kept apart
+    tree = Node(1).add(Node(1.0)).add(Node(Map({"a": 1}))).add(Node(Map({"a": 1.0})))
+    frozen = FrozenTree.from_node(tree)
+    assert [type(frozen.data(index)) for index in range(3)] == [int, float, Map]
+    assert type(frozen.data(2)["a"]) is int
+    assert type(frozen.data(3)["a"]) is float
+
+    # Repeated subtrees are expanded
+    shared = Node("s").add(Node("t"))
+    dag = Node("u").add(shared).add(shared)
+    frozen = FrozenTree.from_node(dag)
+    assert len(frozen) == 5
+    assert frozen.to_node() == dag
+
+
+def test_traversals():
+    tree = newick.parse("((a,b)x,(c,(d,e)z)y,f)r;")
+    frozen = FrozenTree.from_node(tree)
+
+    def names(indices):
+        return "".join(frozen.data(index)["name"] for index in indices)
+
+    assert names(frozen.preorder()) == "rxabyczdef"
+    assert names(frozen.postorder()) == "abxcdezyfr"
+    assert names(frozen.leaves()) == "abcdef"
+    assert names(frozen.children()) == "xyf"
+
+    assert names(frozen.preorder(4)) == "yczde"
+    assert names(frozen.postorder(4)) == "cdezy"
+    assert names(frozen.postorder(2)) == "a"
+    assert names(frozen.leaves(4)) == "cde"
+    assert names(frozen.children(2)) == ""
+
+    assert [frozen.size(index) for index in range(len(frozen))] == [
+        10,
+        3,
+        1,
+        1,
+        5,
+        1,
+        3,
+        1,
+        1,
+        1,
+    ]
+
+    # Postorder matches the zipper-based traversal
+    expected = [cursor.node.data["name"] for cursor in traversal.depth(tree)]
+    assert names(frozen.postorder()) == "".join(expected)
+
+
+def test_views():
+    tree = newick.parse("((a:1,b:2)x,c)r;")
+    frozen = FrozenTree.from_node(tree)
+
+    root = frozen[0]
+    assert root == FrozenNode(frozen, 0)
+    assert root.data == tree.data
+    assert root.parent is None
+    assert not root.is_leaf()
+    assert [child.data["name"] for child in root.children()] == ["x", "c"]
+
+    left = root.edges[0].node
+    assert left.edges == (
+        Edge(FrozenNode(frozen, 2), tree.edges[0].node.edges[0].data),
+        Edge(FrozenNode(frozen, 3), tree.edges[0].node.edges[1].data),
+    )
+    assert left.parent == root
+    assert left.to_node() == tree.edges[0].node
+    assert frozen[-1].is_leaf()
+    assert frozen[-1].data["name"] == "c"
+
+    with pytest.raises(IndexError):
+        frozen[len(frozen)]
+
+
+def test_deep():
+    deep = Node(0)
+
+    for index in range(1, sys.getrecursionlimit() * 3):
+        deep = Node(index).add(deep)
+
+    frozen = FrozenTree.from_node(deep)
+    assert frozen.to_node() == deep
+    assert next(frozen.leaves()) == len(frozen) - 1
+    assert next(frozen.postorder()) == len(frozen) - 1
+
+
+def test_memory():
+    leaves = 1 << 14
+    labels = [f"taxon_{index % 100}" for index in range(leaves)]
+
+    def build():
+        level = [Node(label) for label in labels]
+
+        while len(level) > 1:
+            level = [
+                Node("inner").add(left, data=1.0).add(right, data=2.0)
+                for left, right in zip(level[::2], level[1::2])
+            ]
+
+        return level[0]
+
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tree = build()
+        node_size = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        frozen = FrozenTree.from_node(tree)
+        frozen_size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert frozen.to_node() == tree
+    assert frozen_size * 5 < node_size
@@ -0,0 +1,86 @@
+from sowing.node import Node
+from sowing.intern import InternTable, intern, compress
+from sowing.repr import newick
+from immutables import Map
+import gc
+
+
+def _distinct(root):
+    seen = set()
+    stack = [root]
+
+    while stack:
+        node = stack.pop()
+
+        if id(node) not in seen:
+            seen.add(id(node))
+            stack.extend(edge.node for edge in node.edges)
+
+    return len(seen)
+
+
+def test_intern():
+    table = InternTable()
+    tree1 = newick.parse("((a,b)x,(a,b)x,(c,(a,b)x)y)r;")
+    tree2 = newick.parse("((c,(a,b)x)y,(a,b)x)s;")
+
+    interned1 = table.intern(tree1)
+    interned2 = table.intern(tree2)
+
+    assert interned1 == tree1
+    assert interned2 == tree2
+    assert _distinct(tree1) == 12
+    assert _distinct(interned1) == 6
+
+    # Equal subtrees are shared between trees
+    assert interned1.edges[0].node is interned1.edges[1].node
+    assert interned1.edges[2].node is interned2.edges[0].node
+    assert interned1.edges[0].node is interned2.edges[1].node
+
+    # Equal trees are interned to the same object
+    assert table.intern(newick.parse("((a,b)x,(a,b)x,(c,(a,b)x)y)r;")) is interned1
+
+    # Data of different types is kept apart
+    one = table.intern(Node(1))
+    assert table.intern(Node(1.0)) is not one
+    assert table.intern(Node(1)) is one
+    assert table.intern(Node().add(Node(1), data=1)) is not table.intern(
+        Node().add(Node(1), data=True)
+    )
+    assert table.intern(Node((1,))) is not table.intern(Node((True,)))
+    assert table.intern(Node(Map({"x": 1}))) is not table.intern(Node(Map({"x": 1.0})))
+    assert table.intern(Node().add(Node(), data=Map({"x": 1}))) is not (
+        table.intern(Node().add(Node(), data=Map({"x": True})))
+    )
+
+    # Nodes no longer used are dropped from the table
+    del tree1, tree2, interned1, interned2, one
+    gc.collect()
+    assert len(table) == 0
+
+
+def test_intern_global():
+    tree = Node("a").add(Node("b")).add(Node("c"))
+    assert intern(tree) is intern(Node("a").add(Node("b")).add(Node("c")))
+
+    # Already interned nodes are reused as is
+    assert intern(tree) is tree
+
+
+def test_compress():
+    # Full binary tree with 2^16 leaves, all leaves and all subtrees
+    # at the same level being equal
+    level = [Node("leaf") for _ in range(1 << 16)]
+
+    while len(level) > 1:
+        level = [
+            Node("inner").add(left).add(right)
+            for left, right in zip(level[::2], level[1::2])
+        ]
+
+    tree = level[0]
+    compressed = compress(tree)
+
+    assert compressed == tree
+    assert _distinct(tree) == (1 << 17) - 1
+    assert _distinct(compressed) == 17
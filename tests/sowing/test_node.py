@@ -1,8 +1,15 @@
 from sowing.node import Node, Edge
 from immutables import Map
+from io import StringIO
 from itertools import product
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import copy
+from dataclasses import dataclass
+import pickle
 import pytest
 import sys
+import time
 
 
 def test_add_node():
@@ -162,6 +169,33 @@ def test_children():
     assert children[3] is node_d
 
 
+def test_stats():
+    leaf = Node("a")
+    assert (leaf.size, leaf.height, leaf.leaf_count) == (1, 0, 1)
+
+    root = (
+        Node("r")
+        .add(Node("x").add(Node("a")).add(Node("b").add(Node("c"))))
+        .add(Node("d"))
+    )
+    assert (root.size, root.height, root.leaf_count) == (6, 3, 3)
+
+    left = root.edges[0].node
+    assert (left.size, left.height, left.leaf_count) == (4, 2, 2)
+
+    # Repeated subtrees are counted each time
+    grid = _make_grid(size=30)
+    assert grid.height == 58
+    assert grid.leaf_count == 30067266499541040
+    assert grid.size > grid.leaf_count
+
+    # Deep trees do not hit the recursion limit
+    deep = _make_rec(sys.getrecursionlimit() * 3)
+    assert deep.size == sys.getrecursionlimit() * 3
+    assert deep.height == sys.getrecursionlimit() * 3 - 1
+    assert deep.leaf_count == 1
+
+
 def test_eq_hash():
     assert Node("a") == Node("a")
     assert hash(Node("a")) == hash(Node("a"))
@@ -329,6 +363,86 @@ def test_eq_hash_exp():
     assert hash(root1) == hash(root2)
 
 
+def _make_full(leaves):
+    level = [Node(index) for index in range(leaves)]
+
+    while len(level) > 1:
+        level = [
+            Node("inner").add(left).add(right)
+            for left, right in zip(level[::2], level[1::2])
+        ]
+
+    return level[0]
+
+
+def test_eq_faster():
+    # Comparing two equal trees must be cheaper than walking over both of
+    # them using zippers
+    root1 = _make_full(1 << 15)
+    root2 = _make_full(1 << 15)
+    eq_dur = walk_dur = float("inf")
+
+    for _ in range(3):
+        start = time.perf_counter()
+        assert root1 == root2
+        eq_dur = min(eq_dur, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        cursor1 = root1.unzip().next(preorder=True)
+        cursor2 = root2.unzip().next(preorder=True)
+
+        while not cursor1.is_root():
+            assert cursor1.node.data == cursor2.node.data
+            cursor1 = cursor1.next(preorder=True)
+            cursor2 = cursor2.next(preorder=True)
+
+        walk_dur = min(walk_dur, time.perf_counter() - start)
+
+    assert eq_dur * 1.5 < walk_dur
+
+
+class _CountHash:
+    calls = 0
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        _CountHash.calls += 1
+        return hash(self.value)
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def test_hash_lazy():
+    # Hashes are only computed when needed, once per node
+    _CountHash.calls = 0
+    root = Node(_CountHash(0))
+
+    for index in range(1, sys.getrecursionlimit() * 2):
+        root = Node(_CountHash(index)).add(root).add(Node(_CountHash(-index)))
+
+    assert _CountHash.calls == 0
+
+    other = root.replace(data=_CountHash(0))
+    assert hash(other) != hash(root)
+    assert _CountHash.calls == sys.getrecursionlimit() * 4
+
+    assert hash(root) == hash(root)
+    assert {root: 1}[root] == 1
+    assert _CountHash.calls == sys.getrecursionlimit() * 4
+
+    # Unhashable data is only reported when first hashed
+    unhashable = Node("a").add(Node({"b": 1}))
+
+    with pytest.raises(TypeError):
+        hash(unhashable)
+
+    with pytest.raises(TypeError):
+        unhashable == Node("a").add(Node({"b": 1}))
+
+
 def test_hash_collisions():
     seen = set()
     repeats = 10_000
@@ -339,6 +453,76 @@ def test_hash_collisions():
     assert len(seen) == repeats
 
 
+def _make_labeled():
+    return (
+        Node(Map({"name": "root"}))
+        .add(Node(Map({"name": "a"})), data=Map({"length": "1"}))
+        .add(Node(Map({"name": "b"})).add(Node("c")), data=Map({"length": "2"}))
+    )
+
+
+def _same_as_labeled(tree):
+    return tree == _make_labeled() and hash(tree) == hash(_make_labeled())
+
+
+def test_pickle():
+    tree = _make_labeled()
+    assert pickle.loads(pickle.dumps(tree)) == tree
+    assert pickle.loads(pickle.dumps(Node())) == Node()
+    assert pickle.loads(pickle.dumps(tree.edges[1])) == tree.edges[1]
+    assert copy.copy(tree) is tree
+    assert copy.deepcopy(tree) == tree
+
+    # Deep trees do not hit the recursion limit
+    deep = _make_rec(sys.getrecursionlimit() * 3)
+    assert pickle.loads(pickle.dumps(deep)) == deep
+
+    # Subtrees reachable from several pickled objects are stored only once
+    cursor = deep.unzip()
+
+    while not cursor.is_leaf():
+        cursor = cursor.down()
+
+    assert len(pickle.dumps(cursor)) < len(pickle.dumps(deep)) * 3
+    loaded = pickle.loads(pickle.dumps(cursor))
+    assert loaded.zip() == deep
+    assert loaded.parent.node.edges[0].node is loaded.node
+
+    nodes = [deep]
+
+    while nodes[-1].edges:
+        nodes.append(nodes[-1].edges[0].node)
+
+    assert len(pickle.dumps(nodes)) < len(pickle.dumps(deep)) * 3
+    loaded = pickle.loads(pickle.dumps(nodes))
+    assert all(
+        parent.edges[0].node is child for parent, child in zip(loaded, loaded[1:])
+    )
+
+    # Deep trees with children skipping levels
+    left, right = Node(0), Node(1).add(Node(0))
+
+    for index in range(2, sys.getrecursionlimit() * 3):
+        left, right = right, Node(index).add(right).add(left)
+
+    loaded = pickle.loads(pickle.dumps(right))
+    assert loaded == right
+    assert loaded.edges[0].node.edges[0].node is loaded.edges[1].node
+
+    # Shared subtrees are stored only once
+    grid = _make_grid(size=30)
+    data = pickle.dumps(grid)
+    assert len(data) < 100_000
+
+    loaded = pickle.loads(data)
+    assert loaded == grid
+    assert loaded.edges[0].node.edges[1].node is loaded.edges[1].node.edges[0].node
+
+    # Hashes are recomputed in processes using a different hash seed
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+        assert executor.submit(_same_as_labeled, tree).result()
+
+
 def test_str():
     ascii_chars = {
         "root": ".",
@@ -447,3 +631,152 @@ def test_str():
             "      └──(1, 0) (…)",
         )
     )
+
+
+def test_render():
+    tree = (
+        Node(1)
+        .add(Node(2).add(Node(3)).add(Node(4)).add(Node(5)), data="e")
+        .add(Node(6).add(Node(7).add(Node(8))))
+    )
+
+    assert tree.render() == str(tree)
+    assert tree.render(max_children=2) == "\n".join(
+        (
+            "1",
+            "│  ╭e",
+            "├──2",
+            "│  ├──3",
+            "│  ├──4",
+            "│  └──… 1 more",
+            "└──6",
+            "   └──7",
+            "      └──8",
+        )
+    )
+    assert tree.render(max_depth=1) == "\n".join(
+        (
+            "1",
+            "│  ╭e",
+            "├──2",
+            "│  └──… 3 more",
+            "└──6",
+            "   └──… 1 more",
+        )
+    )
+    assert tree.render(max_depth=0, chars={"elide": "..."}) == "\n".join(
+        (
+            "1",
+            "└──... 2 more",
+        )
+    )
+    assert tree.render(max_lines=4) == "\n".join(("1", "│  ╭e", "├──2", "…"))
+    assert tree.render(max_lines=9) == str(tree)
+    assert tree.render(max_lines=1) == "…"
+
+    file = StringIO()
+    assert tree.render(file, prefix="> ", max_lines=3) is None
+    assert file.getvalue() == "1\n> │  ╭e\n> …\n"
+
+    # Deep trees do not hit the recursion limit
+    deep = Node(0)
+
+    for index in range(1, sys.getrecursionlimit() * 2):
+        deep = Node(index).add(deep)
+
+    assert len(str(deep).splitlines()) == sys.getrecursionlimit() * 2
+    assert deep.render(max_lines=3).splitlines()[-1] == "…"
+
+
+def test_edit_all():
+    tree = (
+        Node("a")
+        .add(Node("b").add(Node("c")).add(Node("d")), data="ab")
+        .add(Node("e").add(Node("f").add(Node("g"))).add(Node("h")))
+        .add(Node("i"))
+    )
+
+    def relabel(cursor):
+        return cursor.replace(node=cursor.node.replace(data=cursor.node.data.upper()))
+
+    def remove(cursor):
+        return cursor.replace(node=None)
+
+    edited = tree.edit_all(
+        [
+            ((0, 1), relabel),
+            (tree.at((1, 0, 0)), relabel),
+            ((1, 0, 0), lambda cursor: cursor.replace(data="edge")),
+            ((0,), lambda cursor: cursor.replace(node=cursor.node.add(Node("x")))),
+            ((1, 1), remove),
+        ]
+    )
+
+    assert edited == (
+        Node("a")
+        .add(Node("b").add(Node("c")).add(Node("D")).add(Node("x")), data="ab")
+        .add(Node("e").add(Node("f").add(Node("G"), data="edge")))
+        .add(Node("i"))
+    )
+
+    # Untouched subtrees are kept as is
+    assert edited.edges[2] is tree.edges[2]
+    assert edited.edges[0].node.edges[0] is tree.edges[0].node.edges[0]
+
+    # Transformations see the edits made to descendants
+    seen = []
+
+    def record(cursor):
+        seen.append(str(cursor.node))
+        return cursor
+
+    tree.edit_all([((0, 1), relabel), ((0,), record)])
+    assert seen == ["b\n├──c\n└──D"]
+
+    assert tree.edit_all([]) is tree
+    assert tree.edit_all([((), remove)]) is None
+    assert tree.edit_all([((), relabel), ((), relabel)]).data == "A"
+
+    # Negative indices designate the same nodes as their positive forms
+    def mark(cursor):
+        return cursor.replace(node=cursor.node.replace(data=cursor.node.data + "!"))
+
+    edited = tree.edit_all([((0, -1), mark), ((0, 1), mark)])
+    assert edited.edges[0].node.edges[1].node == Node("d!!")
+    assert tree.edit_all([((-1,), remove)]) == tree.pop(2)
+
+    with pytest.raises(IndexError):
+        tree.edit_all([((3,), relabel)])
+
+
+def test_edit_all_rebuilds_once():
+    built = 0
+
+    @dataclass(frozen=True, slots=True)
+    class CountNode(Node):
+        def __post_init__(self):
+            nonlocal built
+            built += 1
+
+    # Chain of nodes each having a leaf child, relabel all leaves
+    tree = CountNode(0)
+
+    for index in range(1, 200):
+        tree = CountNode(index).add(CountNode(-index)).add(tree)
+
+    paths = []
+    path = ()
+
+    for _ in range(199):
+        paths.append(path + (0,))
+        path += (1,)
+
+    built = 0
+    edited = tree.edit_all(
+        (path, lambda cursor: cursor.replace(node=cursor.node.replace(data="x")))
+        for path in paths
+    )
+
+    # One new node per leaf, and one per ancestor
+    assert built == 2 * 199
+    assert all(edited.at(path).node.data == "x" for path in paths)
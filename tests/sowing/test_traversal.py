@@ -1,7 +1,9 @@
 from sowing.node import Node
 from sowing.traversal import depth, euler, leaves, topological
 from sowing import traversal
+from sowing.repr import newick
 from itertools import product
+import time
 from .test_node import _make_grid
 
 
@@ -51,6 +53,37 @@ def test_traverse():
     assert_same_nodes(leaves(a, reverse=True), (i, g, f, c))
 
 
+def test_traverse_cursors():
+    tree = (
+        Node("a")
+        .add(Node("b").add(Node("c"), data="bc"), data="ab")
+        .add(Node("d").add(Node("e")).add(Node("f")), data="ad")
+    )
+
+    # Cursors created internally are the same as the ones obtained by
+    # explicitly moving through the tree
+    for cursor in (
+        *depth(tree),
+        *depth(tree, preorder=True, reverse=True),
+        *euler(tree),
+        *leaves(tree, reverse=True),
+    ):
+        path = []
+        bubble = cursor
+
+        while not bubble.is_root():
+            path.append(bubble.index)
+            bubble = bubble.up()
+
+        expected = tree.unzip()
+
+        for index in reversed(path):
+            expected = expected.down(index)
+
+        assert cursor == expected
+        assert cursor.depth == len(path)
+
+
 def test_traverse_dag():
     c = Node("c")
     e = Node("e")
@@ -158,6 +191,155 @@ def test_traverse_dag_exp():
         assert cursor.node.data == cell
 
 
+def test_nodes_edges():
+    assert list(traversal.nodes(None)) == []
+    assert list(traversal.edges(None)) == []
+
+    c = Node("c")
+    e = Node("e")
+    g = Node("g")
+    h = Node("h")
+    f = Node("f").add(g).add(h)
+    d = Node("d").add(e).add(f)
+    b = Node("b").add(c).add(d)
+    i = Node("i").add(d, data="to d")
+    k = Node("k").add(f)
+    m = Node("g")
+    l = Node("f").add(m).add(h)  # noqa: E741
+    j = Node("j").add(k).add(l)
+    a = Node("a").add(b).add(i).add(j)
+
+    # Same order as the zipper-based traversal
+    for preorder, reverse, unique in product(
+        (False, True), (False, True), (False, "id", "eq")
+    ):
+        expected = list(depth(a, preorder=preorder, reverse=reverse, unique=unique))
+        actual = list(
+            traversal.edges(a, preorder=preorder, reverse=reverse, unique=unique)
+        )
+        assert len(actual) == len(expected)
+
+        for (node, level, edge), cursor in zip(actual, expected):
+            assert node is cursor.node
+            assert level == cursor.depth
+
+            if cursor.is_root():
+                assert edge is None
+            else:
+                assert edge is cursor.up().node.edges[cursor.index]
+
+        assert_same_nodes(
+            expected,
+            traversal.nodes(a, preorder=preorder, reverse=reverse, unique=unique),
+        )
+
+    assert (d, 2, i.edges[0]) in traversal.edges(a, preorder=True)
+
+    # Deep trees do not hit the recursion limit
+    deep = Node(0)
+
+    for index in range(1, 3000):
+        deep = Node(index).add(deep)
+
+    assert [node.data for node in traversal.nodes(deep)] == list(range(3000))
+
+    # Repeated subtrees are only visited once if requested
+    grid = _make_grid(30)
+    cells = [node.data for node in traversal.nodes(grid, unique="id")]
+    assert cells == list(product(range(30), repeat=2))
+
+
+def test_nodes_faster():
+    grid = _make_grid(60)
+    tree = Node().extend(Node(index).add(Node(-index)) for index in range(20_000))
+
+    for root, unique in ((tree, False), (grid, "id")):
+        nodes_dur = depth_dur = float("inf")
+
+        for _ in range(3):
+            start = time.perf_counter()
+            count = sum(1 for _ in traversal.nodes(root, unique=unique))
+            nodes_dur = min(nodes_dur, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            assert count == sum(1 for _ in depth(root, unique=unique))
+            depth_dur = min(depth_dur, time.perf_counter() - start)
+
+        assert nodes_dur * 2 < depth_dur
+
+
+def _fold_value(root, up_func, combine_func):
+    values = []
+
+    for node, _, edge in traversal.edges(root):
+        merged = None
+
+        for _ in node.edges:
+            value = values.pop()
+            merged = value if merged is None else combine_func(value, merged)
+
+        values.append(up_func(node, merged, edge.data if edge else None))
+
+    return values[0]
+
+
+def test_reroot_fold():
+    assert traversal.reroot_fold(None, max, max) == []
+
+    tree = newick.parse("((a:1,b:2)x:3,(c:4,(d:5,e:6)z:7)y:8,f:9)r;")
+
+    def length(edge):
+        return float(edge["length"]) if edge is not None else 0.0
+
+    # Number of nodes and total distance to every other node
+    def up_distances(node, merged, edge):
+        count, total = merged if merged is not None else (0, 0.0)
+        return count + 1, total + (count + 1) * length(edge)
+
+    def combine_distances(left, right):
+        return left[0] + right[0], left[1] + right[1]
+
+    # Number of edges on the longest path starting from each node
+    def up_height(node, merged, edge):
+        return 0 if merged is None else merged + 1
+
+    for up_func, combine_func in (
+        (up_distances, combine_distances),
+        (up_height, max),
+    ):
+        results = traversal.reroot_fold(tree, up_func, combine_func)
+        cursors = list(depth(tree, preorder=True))
+        assert len(results) == len(cursors)
+
+        for (node, value), cursor in zip(results, cursors):
+            assert node is cursor.node
+            rerooted = cursor.root().node
+            assert value == _fold_value(rerooted, up_func, combine_func)
+
+    heights = traversal.reroot_fold(tree, up_height, max)
+    assert [(node.data["name"], value) for node, value in heights] == [
+        ("r", 3),
+        ("x", 4),
+        ("a", 5),
+        ("b", 5),
+        ("y", 3),
+        ("c", 4),
+        ("z", 4),
+        ("d", 5),
+        ("e", 5),
+        ("f", 4),
+    ]
+
+    # Deep trees do not hit the recursion limit
+    deep = Node(0)
+
+    for index in range(1, 3000):
+        deep = Node(index).add(deep)
+
+    heights = traversal.reroot_fold(deep, up_height, max)
+    assert [value for _, value in heights] == [max(i, 2999 - i) for i in range(3000)]
+
+
 def test_map_relabel():
     before = (
         Node("a")
@@ -1,6 +1,8 @@
 from sowing.node import Node
 from sowing.zipper import Zipper
+from sowing.traversal import depth
 import pytest
+import sys
 
 
 def test_zip_unzip():
@@ -176,6 +178,25 @@ def test_siblings():
     assert list(zipper.down().down().siblings()) == []
 
 
+def test_sibling_empty():
+    root = Node("a").add(Node("b")).add(Node("c")).add(Node("d"))
+
+    # Moving from a removed node wraps around the remaining children
+    zipper = root.unzip().down(0).replace(node=None)
+    assert zipper.sibling(-1).node == Node("d")
+    assert zipper.sibling(1).node == Node("c")
+    assert zipper.sibling(-1).zip() == Node("a").add(Node("c")).add(Node("d"))
+
+    # Removing the only child leaves no sibling to move to
+    zipper = Node("a").add(Node("b")).unzip().down(0).replace(node=None)
+
+    with pytest.raises(IndexError):
+        zipper.sibling(-1)
+
+    with pytest.raises(IndexError):
+        zipper.sibling(1)
+
+
 def test_edit():
     left = Node("b").add(Node("d").add(Node("e")))
     right = Node("c")
@@ -261,6 +282,56 @@ def test_root():
     assert root.unzip().down(1).down(1).root() == root_789.unzip()
     assert root_789.unzip().down(2).down(1).root() == root.unzip()
 
+    # Rerooting on a deep node does not hit the recursion limit
+    deep = Node(0)
+
+    for index in range(1, sys.getrecursionlimit() * 2):
+        deep = Node(index).add(Node(-index)).add(deep, data=index)
+
+    cursor = deep.unzip()
+
+    while not cursor.is_leaf():
+        cursor = cursor.down(1)
+
+    rerooted = cursor.root()
+    assert rerooted.node.data == 0
+    assert rerooted.node.height == sys.getrecursionlimit() * 2
+    assert rerooted.node.edges[0].data == 1
+    assert rerooted.node.edges[0].node.edges[0].node.data == 2
+    assert rerooted.node.edges[0].node.edges[1].node.data == -1
+
+
+def test_path():
+    root = (
+        Node("a")
+        .add(Node("b").add(Node("c")).add(Node("d")))
+        .add(Node("e").add(Node("f").add(Node("g"))))
+    )
+
+    assert root.unzip().path() == ()
+    assert root.unzip().down(1).down().down().path() == (1, 0, 0)
+    assert root.unzip().down(0).down(-1).path() == (0, 1)
+
+    for cursor in depth(root):
+        assert root.at(cursor.path()) == cursor
+
+    with pytest.raises(IndexError):
+        root.at((0, 2))
+
+    paths = [(1, 0, 0), (0, 1), (), (0,), (0, 1), (1, 0)]
+    cursors = root.at_all(paths)
+    assert [cursor.node.data for cursor in cursors] == ["g", "d", "a", "b", "d", "f"]
+    assert [cursor.path() for cursor in cursors] == paths
+
+    # Common ancestors are shared
+    assert cursors[0].parent is cursors[5]
+    assert cursors[1].parent is cursors[3]
+    assert cursors[3].parent is cursors[2]
+    assert root.at_all([]) == []
+
+    with pytest.raises(IndexError):
+        root.at_all([(0,), (1, 1)])
+
 
 def test_next_prev():
     root = Node("a")
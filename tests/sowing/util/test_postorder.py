@@ -0,0 +1,33 @@
+from sowing.node import Node, Edge
+from sowing.util.postorder import flatten, unflatten
+import sys
+
+
+def test_roundtrip():
+    shared = Node("s").add(Node("t"), data=1)
+    trees = [
+        Node("a").add(Node("b"), data="x").add(shared).add(shared, data=2),
+        Node(),
+        Node("c").add(shared),
+    ]
+    ops, node_data, edge_data = flatten(trees)
+    assert list(ops) == [0, 0, 1, -3, 3, 0, -3, 1]
+    assert node_data == ["b", "t", "s", "a", None, "c"]
+    assert edge_data == ["x", 1, None, 2, None, None, None, None]
+
+    decoded = unflatten(ops, node_data, edge_data, Node, Edge)
+    assert decoded == trees
+    assert decoded[0].edges[1].node is decoded[0].edges[2].node
+    assert decoded[0].edges[1].node is decoded[2].edges[0].node
+
+    assert flatten(()) == flatten([])
+    assert unflatten(*flatten(()), Node, Edge) == []
+
+
+def test_deep():
+    deep = Node(0)
+
+    for index in range(1, sys.getrecursionlimit() * 3):
+        deep = Node(index).add(deep)
+
+    assert unflatten(*flatten([deep]), Node, Edge) == [deep]